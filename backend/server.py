@@ -1,32 +1,56 @@
 from urllib import response
 
 from fastapi import FastAPI, APIRouter, HTTPException, Request, Response, Depends
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.datastructures import Headers, MutableHeaders
+from pymongo import InsertOne, ReadPreference, ReturnDocument, UpdateOne
+from pymongo.monitoring import ConnectionPoolListener
+from pymongo.errors import BulkWriteError, CollectionInvalid, DuplicateKeyError, OperationFailure
 import os
+import io
+import csv
+import json
+import re
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
+from bson import ObjectId
+from pydantic import BaseModel, Field, ValidationError
 from typing import List, Optional, Dict, Any
 import uuid
+import socket
+import secrets
+import hmac
+import hashlib
+import base64
+import time
+import math
+import bisect
+import gzip
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
 import asyncio
-import httpx
-from exponent_server_sdk import PushClient, PushMessage
-import bcrypt
+from concurrent.futures import ProcessPoolExecutor
+import orjson
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
-
-# Create the main app
-app = FastAPI()
+# MongoDB connection, opened in the app lifespan (see create_app)
+client = None
+db = None
+public_db = None  # db with the public read preference, None when not configured
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -38,6 +62,173 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ==================== DATABASE CONNECTION ====================
+
+def optional_int_env(name: str) -> Optional[int]:
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+MONGO_MAX_POOL_SIZE = int(os.environ.get("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.environ.get("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = optional_int_env("MONGO_MAX_IDLE_TIME_MS")
+MONGO_WAIT_QUEUE_TIMEOUT_MS = optional_int_env("MONGO_WAIT_QUEUE_TIMEOUT_MS")
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000"))
+# Wire compression, best first; codecs whose module isn't installed are dropped
+MONGO_COMPRESSORS = os.environ.get("MONGO_COMPRESSORS", "zstd,snappy,zlib")
+# Read preference for public, unauthenticated reads (events, news, ICS).
+# Anything but primary may serve data up to MONGO_MAX_STALENESS_SECONDS old,
+# so cached payloads loaded that way expire after that long.
+MONGO_PUBLIC_READ_PREFERENCE = os.environ.get("MONGO_PUBLIC_READ_PREFERENCE", "primary")
+MONGO_MAX_STALENESS_SECONDS = int(os.environ.get("MONGO_MAX_STALENESS_SECONDS", "90"))
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+def available_compressors() -> List[str]:
+    modules = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+    available = []
+    for name in (c.strip() for c in MONGO_COMPRESSORS.split(",")):
+        if name not in modules:
+            continue
+        try:
+            __import__(modules[name])
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+class PoolMetrics(ConnectionPoolListener):
+    """Connection pool counters across all servers, fed by pymongo's monitoring.
+
+    Callbacks arrive on driver threads; plain integer updates are enough
+    for metrics.
+    """
+
+    def __init__(self):
+        self.open = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checkout_timeouts = 0
+        self.pool_clears = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.pool_clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.open -= 1
+
+    def connection_check_out_started(self, event):
+        self.waiting += 1
+        self.peak_waiting = max(self.peak_waiting, self.waiting)
+
+    def connection_check_out_failed(self, event):
+        self.waiting -= 1
+        self.checkout_failures += 1
+        if event.reason == "timeout":
+            self.checkout_timeouts += 1
+
+    def connection_checked_out(self, event):
+        self.waiting -= 1
+        self.in_use += 1
+        self.checkouts += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def connection_checked_in(self, event):
+        self.in_use -= 1
+
+    def snapshot(self) -> dict:
+        return {
+            "max_pool_size": MONGO_MAX_POOL_SIZE,
+            "min_pool_size": MONGO_MIN_POOL_SIZE,
+            "open": self.open,
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "waiting": self.waiting,
+            "peak_waiting": self.peak_waiting,
+            "saturation": round(self.in_use / MONGO_MAX_POOL_SIZE, 3) if MONGO_MAX_POOL_SIZE else None,
+            "checkouts": self.checkouts,
+            "checkout_failures": self.checkout_failures,
+            "checkout_timeouts": self.checkout_timeouts,
+            "pool_clears": self.pool_clears,
+        }
+
+pool_metrics = PoolMetrics()
+
+def mongo_client_options() -> dict:
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "event_listeners": [pool_metrics],
+    }
+    if MONGO_MAX_IDLE_TIME_MS is not None:
+        options["maxIdleTimeMS"] = MONGO_MAX_IDLE_TIME_MS
+    if MONGO_WAIT_QUEUE_TIMEOUT_MS is not None:
+        options["waitQueueTimeoutMS"] = MONGO_WAIT_QUEUE_TIMEOUT_MS
+    compressors = available_compressors()
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    return options
+
+def connect_database():
+    """Open the Motor client from MONGO_URL / DB_NAME with the pool settings above"""
+    global client, db, public_db
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    options = mongo_client_options()
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'], **options)
+    db = client[os.environ['DB_NAME']]
+    public_db = None
+    if MONGO_PUBLIC_READ_PREFERENCE != "primary":
+        mode = READ_PREFERENCES[MONGO_PUBLIC_READ_PREFERENCE]
+        public_db = db.with_options(read_preference=type(mode)(max_staleness=MONGO_MAX_STALENESS_SECONDS))
+    logger.info(
+        f"MongoDB pool {options['minPoolSize']}-{options['maxPoolSize']}, "
+        f"compressors {options.get('compressors', 'none')}, public reads {MONGO_PUBLIC_READ_PREFERENCE}"
+    )
+
+async def warm_up_pool():
+    """Open minPoolSize connections up front instead of on the first requests"""
+    if client is None or MONGO_MIN_POOL_SIZE <= 0:
+        return
+    started = time.perf_counter()
+    await asyncio.gather(*[db.command("ping") for _ in range(MONGO_MIN_POOL_SIZE)])
+    logger.info(f"Warmed up {pool_metrics.open} MongoDB connections in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+def public_reads():
+    """Database handle for public read endpoints"""
+    return public_db if public_db is not None else db
+
+def public_read_expiry() -> Optional[datetime]:
+    """When data read through public_reads() must be re-read, None if it's always current"""
+    if public_db is None:
+        return None
+    return datetime.now(timezone.utc) + timedelta(seconds=MONGO_MAX_STALENESS_SECONDS)
+
 # ==================== MODELS ====================
 
 class UserBase(BaseModel):
@@ -61,6 +252,7 @@ class User(UserBase):
         "reminder_times": ["24h"]  # 24h, 3h, 1h
     })
     push_token: Optional[str] = None
+    calendar_feed_token: Optional[str] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class UserUpdate(BaseModel):
@@ -84,9 +276,14 @@ class Event(BaseModel):
     end_time: datetime
     category: str  # slug reference
     series_id: Optional[str] = None
+    capacity: Optional[int] = None  # None = unlimited
+    attendee_count: int = 0
+    waitlist_count: int = 0
     created_by: str  # user_id
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    deleted_at: Optional[datetime] = None  # set while in the trash
+    version: int = 1  # bumped by every write, see OPTIMISTIC VERSIONING
 
 class EventCreate(BaseModel):
     title: str
@@ -96,6 +293,7 @@ class EventCreate(BaseModel):
     end_time: datetime
     category: str
     series_id: Optional[str] = None
+    capacity: Optional[int] = Field(default=None, ge=1)
 
 class EventUpdate(BaseModel):
     title: Optional[str] = None
@@ -104,6 +302,17 @@ class EventUpdate(BaseModel):
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     category: Optional[str] = None
+    # An explicit null makes the event unlimited. A capacity below the
+    # current headcount is allowed: everyone going keeps their seat and
+    # nobody new gets one until the headcount drops below it.
+    capacity: Optional[int] = Field(default=None, ge=1)
+
+    def update_fields(self) -> dict:
+        """Fields to $set: the ones given, keeping an explicit capacity null"""
+        fields = {k: v for k, v in self.model_dump().items() if v is not None}
+        if "capacity" in self.model_fields_set and self.capacity is None:
+            fields["capacity"] = None
+        return fields
 
 class News(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -113,6 +322,14 @@ class News(BaseModel):
     publish_date: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     created_by: str  # user_id
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    deleted_at: Optional[datetime] = None  # set while in the trash
+    version: int = 1
+
+# Events and news are soft-deleted: deleted_at marks a tombstone until the
+# TTL index purges it. Every public read filters on this, which matches the
+# partial indexes (documents from before soft delete lack the field and
+# match too), so tombstones cost nothing on the read path.
+NOT_DELETED = {"deleted_at": None}
 
 class NewsCreate(BaseModel):
     title: str
@@ -132,19 +349,265 @@ class UserSession(BaseModel):
 
 # ==================== AUTH HELPERS ====================
 
-async def get_current_user(request: Request) -> Optional[User]:
-    """Get current user from session token (cookie or header)"""
+SESSION_TTL = timedelta(days=int(os.environ.get("SESSION_TTL_DAYS", "7")))
+# Sliding expiration: an active session is pushed forward at most once per
+# interval, so steady traffic doesn't turn every read into a write.
+SESSION_RENEW_INTERVAL = timedelta(minutes=int(os.environ.get("SESSION_RENEW_MINUTES", "15")))
+
+# Optional stateless tokens: when a signing key is configured, clients get an
+# HMAC-signed token carrying user_id, role and expiry that require_auth and
+# require_admin verify without touching the database.
+SESSION_SIGNING_KEY = os.environ.get("SESSION_SIGNING_KEY", "").encode("utf-8")
+SIGNED_TOKEN_PREFIX = "v1."
+REVOCATION_SYNC_SECONDS = int(os.environ.get("REVOCATION_SYNC_SECONDS", "30"))
+
+def b64url_encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+def b64url_decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+def sign_session_token(session_id: str, user: dict, issued_at: datetime) -> str:
+    claims = {
+        "sid": session_id,
+        "uid": user["user_id"],
+        "email": user["email"],
+        "role": user.get("role", "member"),
+        "iat": int(issued_at.timestamp()),
+        "exp": int((issued_at + SESSION_TTL).timestamp()),
+    }
+    payload = b64url_encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    signature = hmac.new(SESSION_SIGNING_KEY, payload.encode("ascii"), hashlib.sha256).digest()
+    return f"{SIGNED_TOKEN_PREFIX}{payload}.{b64url_encode(signature)}"
+
+def decode_signed_token(token: str) -> Optional[dict]:
+    """Claims of a correctly signed token, ignoring expiry and revocation"""
+    if not SESSION_SIGNING_KEY or not token.startswith(SIGNED_TOKEN_PREFIX):
+        return None
+    try:
+        payload, signature = token[len(SIGNED_TOKEN_PREFIX):].split(".")
+        expected = hmac.new(SESSION_SIGNING_KEY, payload.encode("ascii"), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, b64url_decode(signature)):
+            return None
+        return json.loads(b64url_decode(payload))
+    except (ValueError, UnicodeError):
+        return None
+
+class RevocationList:
+    """In-memory mirror of db.token_revocations.
+
+    Revocations made by this worker apply immediately; those made by other
+    workers arrive with the next periodic sync.
+    """
+
+    def __init__(self):
+        self.sessions: Dict[str, float] = {}  # sid -> expiry (epoch)
+        self.users: Dict[str, float] = {}  # user_id -> revoked at (epoch)
+        self.synced_until: Optional[datetime] = None
+
+    def is_revoked(self, claims: dict) -> bool:
+        if claims["sid"] in self.sessions:
+            return True
+        revoked_at = self.users.get(claims["uid"])
+        return revoked_at is not None and claims["iat"] <= revoked_at
+
+    def apply(self, entry: dict) -> None:
+        if entry["kind"] == "session":
+            self.sessions[entry["value"]] = entry["expires_at"].replace(tzinfo=timezone.utc).timestamp()
+        else:
+            revoked_at = entry["revoked_at"].replace(tzinfo=timezone.utc).timestamp()
+            self.users[entry["value"]] = max(revoked_at, self.users.get(entry["value"], 0))
+
+    async def revoke(self, kind: str, value: str, expires_at: datetime) -> None:
+        entry = {
+            "kind": kind,
+            "value": value,
+            "revoked_at": datetime.now(timezone.utc),
+            "expires_at": expires_at,
+        }
+        self.apply(entry)
+        await db.token_revocations.insert_one(entry)
+
+    async def sync(self) -> None:
+        now = datetime.now(timezone.utc)
+        query = {"expires_at": {"$gt": now}}
+        if self.synced_until:
+            # Overlap a little so entries written during the last sync aren't missed
+            query["revoked_at"] = {"$gte": self.synced_until - timedelta(seconds=5)}
+        async for entry in db.token_revocations.find(query, {"_id": 0}):
+            self.apply(entry)
+        self.synced_until = now
+
+        cutoff = now.timestamp()
+        self.sessions = {sid: exp for sid, exp in self.sessions.items() if exp > cutoff}
+        user_cutoff = cutoff - SESSION_TTL.total_seconds()
+        self.users = {uid: at for uid, at in self.users.items() if at > user_cutoff}
+
+revocations = RevocationList()
+
+async def sync_revocations_forever():
+    while True:
+        try:
+            await revocations.sync()
+        except Exception as e:
+            logger.error(f"Revocation sync failed: {e}")
+        await asyncio.sleep(REVOCATION_SYNC_SECONDS)
+
+def verify_signed_token(token: str) -> Optional[dict]:
+    claims = decode_signed_token(token)
+    if not claims or claims["exp"] < time.time() or revocations.is_revoked(claims):
+        return None
+    return claims
+
+def session_token_from_request(request: Request) -> Optional[str]:
     session_token = request.cookies.get("session_token")
     if not session_token:
         auth_header = request.headers.get("Authorization")
         if auth_header and auth_header.startswith("Bearer "):
             session_token = auth_header.split(" ")[1]
+    return session_token
+
+# Each user may stay signed in on this many devices. A new login beyond the
+# cap evicts the least recently used session instead of all of them.
+MAX_SESSIONS_PER_USER = int(os.environ.get("MAX_SESSIONS_PER_USER", "5"))
+
+def session_public_id(session_token: str) -> str:
+    """Stable handle for a session that doesn't reveal the bearer token"""
+    return hashlib.sha256(session_token.encode("utf-8")).hexdigest()[:16]
+
+async def end_sessions(user_id: str, session_tokens: List[str]) -> None:
+    """Delete sessions and, for signed tokens, revoke them"""
+    if not session_tokens:
+        return
+    await db.user_sessions.delete_many({"session_token": {"$in": session_tokens}})
+    await db.session_sets.update_one(
+        {"_id": user_id},
+        {"$pull": {"sessions": {"token": {"$in": session_tokens}}}}
+    )
+    if SESSION_SIGNING_KEY:
+        expires_at = datetime.now(timezone.utc) + SESSION_TTL
+        for session_token in session_tokens:
+            await revocations.revoke("session", session_token, expires_at)
+
+async def start_session(response: Response, user: dict, session_token: Optional[str] = None,
+                        user_agent: Optional[str] = None) -> str:
+    """Store a new session for the user, set the cookie and return the client token"""
+    session_token = session_token or str(uuid.uuid4())
+    now = datetime.now(timezone.utc)
+    await db.user_sessions.update_one(
+        {"session_token": session_token},
+        {"$set": {
+            "user_id": user["user_id"],
+            "expires_at": now + SESSION_TTL,
+            "created_at": now,
+            "user_agent": user_agent,
+            # The row's token is then only the sid inside the signed token
+            # and must never work as an opaque bearer token on its own
+            "signed": bool(SESSION_SIGNING_KEY),
+        }},
+        upsert=True,
+    )
+
+    # The set of live sessions is kept ordered by last use and trimmed to
+    # the cap in one atomic update.
+    entry = {"token": session_token, "used_at": now.timestamp()}
+    after = await db.session_sets.find_one_and_update(
+        {"_id": user["user_id"]},
+        {"$push": {"sessions": {
+            "$each": [entry],
+            "$sort": {"used_at": 1},
+            "$slice": -MAX_SESSIONS_PER_USER,
+        }}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    kept = after["sessions"]
+    if len(kept) >= MAX_SESSIONS_PER_USER:
+        # Whatever the $slice dropped, now or in a concurrent login, was
+        # last used before everything it kept. A concurrent login that has
+        # yet to push is newer than that and is left alone.
+        oldest_kept = datetime.fromtimestamp(min(e["used_at"] for e in kept), timezone.utc)
+        dropped = [s["session_token"] async for s in db.user_sessions.find({
+            "user_id": user["user_id"],
+            "session_token": {"$nin": [e["token"] for e in kept]},
+            "created_at": {"$lt": oldest_kept},
+        }, {"_id": 0, "session_token": 1})]
+        await end_sessions(user["user_id"], dropped)
+
+    if SESSION_SIGNING_KEY:
+        session_token = sign_session_token(session_token, user, now)
+
+    set_session_cookie(response, session_token)
+    return session_token
+
+def set_session_cookie(response: Response, session_token: str) -> None:
+    response.set_cookie(
+        key="session_token",
+        value=session_token,
+        httponly=True,
+        secure=True,
+        samesite="none",
+        path="/",
+        max_age=int(SESSION_TTL.total_seconds()),
+    )
+
+class SessionCookieMiddleware:
+    """Re-sends the session cookie with a fresh max_age when a request renewed it.
+
+    Renewal happens deep in the auth helpers, which have no response to
+    set the cookie on; they leave the token in the request state instead.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_with_cookie(message):
+            renewed = scope.get("state", {}).get("renewed_session_token")
+            if message["type"] == "http.response.start" and renewed:
+                headers = MutableHeaders(raw=message["headers"])
+                # A login or logout response sets the cookie itself
+                if not any(v.startswith("session_token=") for v in headers.getlist("set-cookie")):
+                    cookie = Response()
+                    set_session_cookie(cookie, renewed)
+                    headers.append("set-cookie", cookie.headers["set-cookie"])
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+async def get_current_user(request: Request) -> Optional[User]:
+    """Get current user from session token (cookie or header)"""
+    session_token = session_token_from_request(request)
     
     if not session_token:
         return None
+
+    if session_token.startswith(SIGNED_TOKEN_PREFIX) and SESSION_SIGNING_KEY:
+        claims = verify_signed_token(session_token)
+        if not claims:
+            return None
+        user_id = claims["uid"]
+    else:
+        user_id = await get_session_user_id(session_token, request)
+        if not user_id:
+            return None
+    
+    user_doc = await db.users.find_one(
+        {"user_id": user_id},
+        {"_id": 0}
+    )
+    if not user_doc:
+        return None
     
+    return User(**user_doc)
+
+async def get_session_user_id(session_token: str, request: Optional[Request] = None) -> Optional[str]:
+    """Resolve an opaque session token through user_sessions"""
     session_doc = await db.user_sessions.find_one(
-        {"session_token": session_token},
+        {"session_token": session_token, "signed": {"$ne": True}},
         {"_id": 0}
     )
     if not session_doc:
@@ -155,26 +618,64 @@ async def get_current_user(request: Request) -> Optional[User]:
         expires_at = datetime.fromisoformat(expires_at)
     if expires_at.tzinfo is None:
         expires_at = expires_at.replace(tzinfo=timezone.utc)
-    if expires_at < datetime.now(timezone.utc):
+    now = datetime.now(timezone.utc)
+    if expires_at < now:
         return None
-    
+
+    if SESSION_TTL - (expires_at - now) > SESSION_RENEW_INTERVAL:
+        await db.user_sessions.update_one(
+            {"session_token": session_token},
+            {"$set": {"expires_at": now + SESSION_TTL}}
+        )
+        await db.session_sets.update_one(
+            {"_id": session_doc["user_id"], "sessions.token": session_token},
+            {"$set": {"sessions.$.used_at": now.timestamp()}}
+        )
+        if request is not None and request.cookies.get("session_token") == session_token:
+            request.state.renewed_session_token = session_token
+
+    return session_doc["user_id"]
+
+class Principal:
+    """The authenticated caller as authorization checks see it"""
+    __slots__ = ("user_id", "email", "role")
+
+    def __init__(self, user_id: str, email: str, role: str):
+        self.user_id = user_id
+        self.email = email
+        self.role = role
+
+async def require_auth(request: Request) -> Principal:
+    """Require authenticated user.
+
+    Only user_id, email and role are resolved: from the claims of a signed
+    token, otherwise from a projected user lookup. Handlers that need the
+    rest of the profile use require_user_profile.
+    """
+    session_token = session_token_from_request(request)
+    if session_token and session_token.startswith(SIGNED_TOKEN_PREFIX) and SESSION_SIGNING_KEY:
+        claims = verify_signed_token(session_token)
+        if not claims:
+            raise HTTPException(status_code=401, detail="Ej autentiserad")
+        return Principal(claims["uid"], claims["email"], claims["role"])
+
+    user_id = await get_session_user_id(session_token, request) if session_token else None
     user_doc = await db.users.find_one(
-        {"user_id": session_doc["user_id"]},
-        {"_id": 0}
-    )
+        {"user_id": user_id},
+        {"_id": 0, "user_id": 1, "email": 1, "role": 1}
+    ) if user_id else None
     if not user_doc:
-        return None
-    
-    return User(**user_doc)
+        raise HTTPException(status_code=401, detail="Ej autentiserad")
+    return Principal(user_doc["user_id"], user_doc["email"], user_doc.get("role", "member"))
 
-async def require_auth(request: Request) -> User:
-    """Require authenticated user"""
+async def require_user_profile(request: Request) -> User:
+    """Require authenticated user, loaded in full from the database"""
     user = await get_current_user(request)
     if not user:
         raise HTTPException(status_code=401, detail="Ej autentiserad")
     return user
 
-async def require_admin(request: Request) -> User:
+async def require_admin(request: Request) -> Principal:
     """Require admin user"""
     user = await require_auth(request)
     if user.role != "admin":
@@ -185,10 +686,12 @@ async def require_admin(request: Request) -> User:
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt"""
+    import bcrypt
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
 def verify_password(password: str, hashed: str) -> bool:
     """Verify a password against its hash"""
+    import bcrypt
     return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
 async def seed_database():
@@ -201,10 +704,13 @@ async def seed_database():
         {"id": "cat_special", "name": "Specialevent", "slug": "special_event", "color": "#F4A261"},
     ]
     
+    existing_slugs = {c["slug"] async for c in db.categories.find(
+        {"slug": {"$in": [cat["slug"] for cat in default_categories]}}, {"_id": 0, "slug": 1}
+    )}
     for cat in default_categories:
-        existing = await db.categories.find_one({"slug": cat["slug"]})
-        if not existing:
-            await db.categories.insert_one(cat)
+        if cat["slug"] not in existing_slugs:
+            await db.categories.insert_one(dict(cat))
+            await record_change("categories", "create", cat["id"], cat)
             logger.info(f"Created category: {cat['name']}")
     
     # Seed admin user with password
@@ -238,20 +744,10 @@ async def seed_database():
         }
         await db.users.insert_one(admin_user)
         logger.info(f"Created admin user: {admin_email}")
-    else:
-        # Only re-hash if the env password actually changed (bcrypt is intentionally slow)
-        updates: dict = {}
-        if not verify_password(admin_password, existing_admin.get("password_hash", "")):
-            updates["password_hash"] = hash_password(admin_password)
-            logger.info(f"Updated admin password for: {admin_email}")
-        if existing_admin.get("role") != "admin":
-            updates["role"] = "admin"
-        if updates:
-            await db.users.update_one({"email": admin_email}, {"$set": updates})
 
     # Seed some sample events
-    existing_events = await db.events.count_documents({})
-    if existing_events == 0:
+    existing_events = await db.events.find_one({}, {"_id": 1})
+    if not existing_events:
         admin = await db.users.find_one({"email": admin_email})
         if admin:
             sample_events = [
@@ -265,7 +761,8 @@ async def seed_database():
                     "category": "open_game_night",
                     "created_by": admin["user_id"],
                     "created_at": datetime.now(timezone.utc),
-                    "updated_at": datetime.now(timezone.utc)
+                    "updated_at": datetime.now(timezone.utc),
+                    "version": 1
                 },
                 {
                     "id": str(uuid.uuid4()),
@@ -277,7 +774,8 @@ async def seed_database():
                     "category": "member_night",
                     "created_by": admin["user_id"],
                     "created_at": datetime.now(timezone.utc),
-                    "updated_at": datetime.now(timezone.utc)
+                    "updated_at": datetime.now(timezone.utc),
+                    "version": 1
                 }
             ]
             for event in sample_events:
@@ -285,8 +783,8 @@ async def seed_database():
             logger.info("Created sample events")
     
     # Seed some sample news
-    existing_news = await db.news.count_documents({})
-    if existing_news == 0:
+    existing_news = await db.news.find_one({}, {"_id": 1})
+    if not existing_news:
         admin = await db.users.find_one({"email": admin_email})
         if admin:
             sample_news = [
@@ -297,13 +795,212 @@ async def seed_database():
                     "image": None,
                     "publish_date": datetime.now(timezone.utc),
                     "created_by": admin["user_id"],
-                    "created_at": datetime.now(timezone.utc)
+                    "created_at": datetime.now(timezone.utc),
+                    "version": 1
                 }
             ]
             for news in sample_news:
                 await db.news.insert_one(news)
             logger.info("Created sample news")
 
+async def sync_admin_password():
+    """Keep the admin account in line with ADMIN_PASSWORD.
+
+    Runs in the background on every boot; bcrypt is intentionally slow, so
+    the check happens off the event loop and only re-hashes on a change.
+    """
+    admin_email = os.environ.get("ADMIN_EMAIL", "admin@borka.se")
+    admin_password = os.environ.get("ADMIN_PASSWORD", "asdqwe123")
+
+    existing_admin = await db.users.find_one({"email": admin_email}, {"_id": 0, "password_hash": 1, "role": 1})
+    if not existing_admin:
+        return
+    loop = asyncio.get_running_loop()
+    updates: dict = {}
+    if not await loop.run_in_executor(None, verify_password, admin_password, existing_admin.get("password_hash", "")):
+        updates["password_hash"] = await loop.run_in_executor(None, hash_password, admin_password)
+        logger.info(f"Updated admin password for: {admin_email}")
+    if existing_admin.get("role") != "admin":
+        updates["role"] = "admin"
+    if updates:
+        await db.users.update_one({"email": admin_email}, {"$set": updates})
+
+# ==================== MIGRATIONS ====================
+
+async def migrate_session_expiry_dates():
+    """Store user_sessions.expires_at as BSON dates and drop expired sessions.
+
+    The TTL index only reaps date values, and string timestamps force a
+    fromisoformat parse on every authenticated request.
+    """
+    now = datetime.now(timezone.utc)
+    updates = []
+    async for session in db.user_sessions.find({"expires_at": {"$type": "string"}}, {"_id": 1, "expires_at": 1}):
+        expires_at = datetime.fromisoformat(session["expires_at"].replace("Z", "+00:00"))
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        updates.append(UpdateOne({"_id": session["_id"]}, {"$set": {"expires_at": expires_at}}))
+        if len(updates) >= 500:
+            await db.user_sessions.bulk_write(updates, ordered=False)
+            updates = []
+    if updates:
+        await db.user_sessions.bulk_write(updates, ordered=False)
+
+    result = await db.user_sessions.delete_many({"expires_at": {"$lt": now}})
+    logger.info(f"Removed {result.deleted_count} expired sessions")
+
+async def migrate_live_partial_indexes():
+    """Drop the full start_time/category/publish_date indexes.
+
+    ensure_indexes replaces them with partial indexes over live (not
+    soft-deleted) documents.
+    """
+    for collection, index in (("events", "start_time_1"), ("events", "category_1"), ("news", "publish_date_1")):
+        try:
+            await db[collection].drop_index(index)
+        except OperationFailure:
+            pass  # already gone, or never created
+
+async def migrate_signed_session_rows():
+    """Flag sessions issued before rows recorded whether they were signed.
+
+    With a signing key configured, existing rows back signed tokens, so
+    their sid must stop working as an opaque bearer token.
+    """
+    if SESSION_SIGNING_KEY:
+        await db.user_sessions.update_many({"signed": {"$exists": False}}, {"$set": {"signed": True}})
+
+async def migrate_document_versions():
+    """Give events and news written before optimistic versioning version 1"""
+    for collection in ("events", "news"):
+        await db[collection].update_many({"version": {"$exists": False}}, {"$set": {"version": 1}})
+
+# Applied once per database, in order. Migrations must be idempotent since
+# two workers booting together may both run one.
+MIGRATIONS = [
+    ("2026_10_session_expiry_dates", migrate_session_expiry_dates),
+    ("2026_10_live_partial_indexes", migrate_live_partial_indexes),
+    ("2026_10_document_versions", migrate_document_versions),
+    ("2026_10_signed_session_rows", migrate_signed_session_rows),
+]
+
+async def run_migrations():
+    applied = {m["_id"] async for m in db.migrations.find({}, {"_id": 1})}
+    for name, migration in MIGRATIONS:
+        if name in applied:
+            continue
+        await migration()
+        try:
+            await db.migrations.insert_one({"_id": name, "applied_at": datetime.now(timezone.utc)})
+        except DuplicateKeyError:
+            pass
+        logger.info(f"Applied migration {name}")
+
+# ==================== RATE LIMITING ====================
+
+class TokenBuckets:
+    """In-process token buckets, one (tokens, last refill) tuple per key.
+
+    Buckets that have been idle long enough to be full again carry no
+    information and are dropped by a periodic decay pass.
+    """
+
+    DECAY_INTERVAL = 60.0
+
+    def __init__(self, capacity: int, refill_per_minute: float):
+        self.capacity = capacity
+        self.rate = refill_per_minute / 60.0
+        self.buckets: Dict[str, tuple] = {}
+        self.last_decay = time.monotonic()
+
+    async def take(self, key: str) -> float:
+        """Consume a token; returns 0 if allowed, else seconds until one is available"""
+        now = time.monotonic()
+        if now - self.last_decay > self.DECAY_INTERVAL:
+            self.decay(now)
+
+        tokens, refilled_at = self.buckets.get(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - refilled_at) * self.rate)
+        if tokens >= 1:
+            self.buckets[key] = (tokens - 1, now)
+            return 0.0
+        self.buckets[key] = (tokens, now)
+        return (1 - tokens) / self.rate
+
+    def decay(self, now: float) -> None:
+        full_after = self.capacity / self.rate
+        self.buckets = {k: v for k, v in self.buckets.items() if now - v[1] < full_after}
+        self.last_decay = now
+
+class MongoTokenBuckets(TokenBuckets):
+    """Token buckets shared by all workers, updated atomically in db.rate_limits"""
+
+    def __init__(self, name: str, capacity: int, refill_per_minute: float):
+        super().__init__(capacity, refill_per_minute)
+        self.name = name
+
+    async def take(self, key: str) -> float:
+        refill_ms = self.capacity / self.rate * 1000
+        elapsed_seconds = {"$divide": [{"$subtract": ["$$NOW", {"$ifNull": ["$refilled_at", "$$NOW"]}]}, 1000]}
+        refilled = {"$min": [
+            self.capacity,
+            {"$add": [{"$ifNull": ["$tokens", self.capacity]}, {"$multiply": [elapsed_seconds, self.rate]}]},
+        ]}
+        bucket = await db.rate_limits.find_one_and_update(
+            {"_id": f"{self.name}:{key}"},
+            [
+                {"$set": {"tokens": refilled, "refilled_at": "$$NOW", "expires_at": {"$add": ["$$NOW", refill_ms]}}},
+                {"$set": {
+                    "allowed": {"$gte": ["$tokens", 1]},
+                    "tokens": {"$cond": [{"$gte": ["$tokens", 1]}, {"$subtract": ["$tokens", 1]}, "$tokens"]},
+                }},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return 0.0 if bucket["allowed"] else (1 - bucket["tokens"]) / self.rate
+
+def make_token_buckets(name: str, capacity: int, refill_per_minute: float) -> TokenBuckets:
+    # "mongo" shares limits across uvicorn workers; the in-memory default is
+    # per worker and doubles as the stand-in for tests
+    if os.environ.get("RATE_LIMIT_BACKEND", "memory") == "mongo":
+        return MongoTokenBuckets(name, capacity, refill_per_minute)
+    return TokenBuckets(capacity, refill_per_minute)
+
+login_ip_limiter = make_token_buckets(
+    "login_ip",
+    int(os.environ.get("LOGIN_IP_BURST", "20")),
+    float(os.environ.get("LOGIN_IP_PER_MINUTE", "10")),
+)
+login_email_limiter = make_token_buckets(
+    "login_email",
+    int(os.environ.get("LOGIN_EMAIL_BURST", "5")),
+    float(os.environ.get("LOGIN_EMAIL_PER_MINUTE", "1")),
+)
+
+async def enforce_rate_limit(limiter: TokenBuckets, key: str) -> None:
+    retry_after = await limiter.take(key)
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=429,
+            detail="För många inloggningsförsök, försök igen senare",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+# Reverse proxies in front of the backend. Each one appends the address it
+# saw to X-Forwarded-For, so the entry this many places from the end is the
+# last one a client can't forge. Defaults to 0 (X-Forwarded-For ignored);
+# deployments behind an ingress or proxy must set it, usually to 1.
+TRUSTED_PROXY_HOPS = int(os.environ.get("TRUSTED_PROXY_HOPS", "0"))
+
+def client_ip(request: Request) -> str:
+    """Client address for rate limits and the audit log"""
+    if TRUSTED_PROXY_HOPS:
+        hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        if len(hops) >= TRUSTED_PROXY_HOPS:
+            return hops[-TRUSTED_PROXY_HOPS]
+    return request.client.host if request.client else "unknown"
+
 # ==================== AUTH ENDPOINTS ====================
 
 class EmailLoginRequest(BaseModel):
@@ -316,8 +1013,12 @@ class EmailRegisterRequest(BaseModel):
     name: str
 
 @api_router.post("/auth/login")
-async def email_login(request: EmailLoginRequest, response: Response):
+async def email_login(request: EmailLoginRequest, response: Response, http_request: Request):
     """Login with email and password"""
+    # Throttle before any database or bcrypt work
+    await enforce_rate_limit(login_ip_limiter, client_ip(http_request))
+    await enforce_rate_limit(login_email_limiter, request.email.lower().strip())
+
     user = await db.users.find_one({"email": request.email.lower()}, {"_id": 0})
 
     if not user:
@@ -329,30 +1030,7 @@ async def email_login(request: EmailLoginRequest, response: Response):
     if not verify_password(request.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Fel e-post eller lösenord")
 
-    # Create session
-    session_token = str(uuid.uuid4())
-    expires_at = datetime.now(timezone.utc) + timedelta(days=7)
-    session_doc = {
-        "session_token": session_token,
-        "user_id": user["user_id"],
-        "expires_at": expires_at,
-        "created_at": datetime.now(timezone.utc),
-    }
-
-    # Remove old sessions
-    await db.user_sessions.delete_many({"user_id": user["user_id"]})
-    await db.user_sessions.insert_one(session_doc)
-
-    # (Valfritt) cookie – funkar om CORS är rätt
-    response.set_cookie(
-        key="session_token",
-        value=session_token,
-        httponly=True,
-        secure=True,
-        samesite="none",
-        path="/",
-        max_age=7 * 24 * 60 * 60,
-    )
+    session_token = await start_session(response, user, user_agent=http_request.headers.get("User-Agent"))
 
     user_response = {k: v for k, v in user.items() if k != "password_hash"}
     logger.info(f"User logged in: {request.email}")
@@ -360,8 +1038,9 @@ async def email_login(request: EmailLoginRequest, response: Response):
 
 
 @api_router.post("/auth/register")
-async def email_register(request: EmailRegisterRequest, response: Response):
+async def email_register(request: EmailRegisterRequest, response: Response, http_request: Request):
     """Register with email and password"""
+    await enforce_rate_limit(login_ip_limiter, client_ip(http_request))
     email = request.email.lower().strip()
 
     existing = await db.users.find_one({"email": email})
@@ -395,29 +1074,7 @@ async def email_register(request: EmailRegisterRequest, response: Response):
 
     await db.users.insert_one(new_user)
 
-    # Create session (EN gång)
-    session_token = str(uuid.uuid4())
-    expires_at = datetime.now(timezone.utc) + timedelta(days=7)
-    session_doc = {
-        "session_token": session_token,
-        "user_id": user_id,
-        "expires_at": expires_at,
-        "created_at": datetime.now(timezone.utc),
-    }
-
-    # (bra att rensa gamla sessioner också, valfritt)
-    await db.user_sessions.delete_many({"user_id": user_id})
-    await db.user_sessions.insert_one(session_doc)
-
-    response.set_cookie(
-        key="session_token",
-        value=session_token,
-        httponly=True,
-        secure=True,
-        samesite="none",
-        path="/",
-        max_age=7 * 24 * 60 * 60,
-    )
+    session_token = await start_session(response, new_user, user_agent=http_request.headers.get("User-Agent"))
 
     user_response = {k: v for k, v in new_user.items() if k != "password_hash"}
     logger.info(f"New user registered: {email}")
@@ -433,6 +1090,7 @@ async def create_session(request: Request, response: Response):
         raise HTTPException(status_code=400, detail="session_id krävs")
     
     # Call Emergent Auth to get user data
+    import httpx
     async with httpx.AsyncClient() as client:
         auth_response = await client.get(
             "https://demobackend.emergentagent.com/auth/v1/env/oauth/session-data",
@@ -502,32 +1160,10 @@ async def create_session(request: Request, response: Response):
         }
         await db.users.insert_one(new_user)
     
-    # Create session
-    expires_at = datetime.now(timezone.utc) + timedelta(days=7)
-    session_doc = {
-        "session_token": session_token,
-        "user_id": user_id,
-        "expires_at": expires_at,
-        "created_at": datetime.now(timezone.utc)
-    }
-    
-    # Remove old sessions for this user
-    await db.user_sessions.delete_many({"user_id": user_id})
-    await db.user_sessions.insert_one(session_doc)
-    
-    # Set cookie
-    response.set_cookie(
-        key="session_token",
-        value=session_token,
-        httponly=True,
-        secure=True,
-        samesite="none",
-        path="/",
-        max_age=7 * 24 * 60 * 60
-    )
-    
-    # Get user data
     user_doc = await db.users.find_one({"user_id": user_id}, {"_id": 0})
+    session_token = await start_session(
+        response, user_doc, session_token, user_agent=request.headers.get("User-Agent")
+    )
     
     return {"user": user_doc, "session_token": session_token}
 
@@ -542,14 +1178,22 @@ async def get_me(request: Request):
 @api_router.post("/auth/logout")
 async def logout(request: Request, response: Response):
     """Logout and clear session"""
-    session_token = request.cookies.get("session_token")
-    if not session_token:
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            session_token = auth_header.split(" ")[1]
+    session_token = session_token_from_request(request)
+
+    claims = decode_signed_token(session_token) if session_token else None
+    if claims:
+        await revocations.revoke(
+            "session", claims["sid"], datetime.fromtimestamp(claims["exp"], timezone.utc)
+        )
+        session_token = claims["sid"]
 
     if session_token:
-        await db.user_sessions.delete_many({"session_token": session_token})
+        session_doc = await db.user_sessions.find_one_and_delete({"session_token": session_token})
+        if session_doc:
+            await db.session_sets.update_one(
+                {"_id": session_doc["user_id"]},
+                {"$pull": {"sessions": {"token": session_token}}}
+            )
 
     response.delete_cookie(key="session_token", path="/")
     return {"message": "Utloggad"}
@@ -559,7 +1203,7 @@ async def logout(request: Request, response: Response):
 @api_router.get("/users/me")
 async def get_user_profile(request: Request):
     """Get current user profile"""
-    user = await require_auth(request)
+    user = await require_user_profile(request)
     return user.model_dump()
 
 @api_router.put("/users/me")
@@ -568,6 +1212,9 @@ async def update_user_profile(request: Request, update: UserUpdate):
     user = await require_auth(request)
     
     update_data = {k: v for k, v in update.model_dump().items() if v is not None}
+    if "notification_preferences" in update_data:
+        # Tells an explicit empty category selection apart from the defaults
+        update_data["preferences_saved_at"] = datetime.now(timezone.utc)
     if update_data:
         await db.users.update_one(
             {"user_id": user.user_id},
@@ -591,6 +1238,37 @@ async def update_push_token(request: Request):
     
     return {"message": "Push token uppdaterad"}
 
+def calendar_feed_response(feed_token: str) -> dict:
+    return {"feed_token": feed_token, "path": f"/api/calendar/{feed_token}.ics"}
+
+@api_router.get("/users/me/calendar-feed")
+async def get_calendar_feed(request: Request):
+    """Get (or create) the user's personal ICS subscription feed"""
+    user = await require_user_profile(request)
+
+    feed_token = user.calendar_feed_token
+    if not feed_token:
+        feed_token = secrets.token_urlsafe(24)
+        await db.users.update_one(
+            {"user_id": user.user_id},
+            {"$set": {"calendar_feed_token": feed_token}}
+        )
+
+    return calendar_feed_response(feed_token)
+
+@api_router.post("/users/me/calendar-feed/rotate")
+async def rotate_calendar_feed(request: Request):
+    """Replace the user's feed token, invalidating previously shared feed URLs"""
+    user = await require_auth(request)
+    feed_token = secrets.token_urlsafe(24)
+
+    await db.users.update_one(
+        {"user_id": user.user_id},
+        {"$set": {"calendar_feed_token": feed_token}}
+    )
+
+    return calendar_feed_response(feed_token)
+
 # ==================== ADMIN USER MANAGEMENT ====================
 
 class AdminCreateUser(BaseModel):
@@ -600,30 +1278,15 @@ class AdminCreateUser(BaseModel):
     role: Optional[str] = "member"  # member | admin
 
 
-@api_router.post("/admin/users")
-async def admin_create_user(request: Request, body: AdminCreateUser):
-    """Admin creates a member account with a password"""
-    admin = await require_admin(request)
-
-    email = body.email.lower().strip()
-
-    if len(body.password) < 6:
-        raise HTTPException(status_code=400, detail="Lösenordet måste vara minst 6 tecken")
-
-    # Check existing
-    existing = await db.users.find_one({"email": email})
-    if existing:
-        raise HTTPException(status_code=400, detail="Användaren finns redan")
-
-    user_id = f"user_{uuid.uuid4().hex[:12]}"
-
-    new_user = {
-        "user_id": user_id,
+def new_member_doc(email: str, name: str, password_hash: str, role: str) -> dict:
+    """User document for an admin-created email account"""
+    return {
+        "user_id": f"user_{uuid.uuid4().hex[:12]}",
         "email": email,
-        "name": body.name,
-        "password_hash": hash_password(body.password),
+        "name": name,
+        "password_hash": password_hash,
         "picture": None,
-        "role": body.role,
+        "role": role,
         "phone": None,
         "auth_type": "email",
         "notification_preferences": {
@@ -641,18 +1304,249 @@ async def admin_create_user(request: Request, body: AdminCreateUser):
         "created_at": datetime.now(timezone.utc)
     }
 
+@api_router.post("/admin/users")
+async def admin_create_user(request: Request, body: AdminCreateUser):
+    """Admin creates a member account with a password"""
+    admin = await require_admin(request)
+
+    email = body.email.lower().strip()
+
+    if len(body.password) < 6:
+        raise HTTPException(status_code=400, detail="Lösenordet måste vara minst 6 tecken")
+
+    # Check existing
+    existing = await db.users.find_one({"email": email})
+    if existing:
+        raise HTTPException(status_code=400, detail="Användaren finns redan")
+
+    new_user = new_member_doc(email, body.name, hash_password(body.password), body.role)
+    user_id = new_user["user_id"]
+
     await db.users.insert_one(new_user)
 
+    audit_log.record(request, admin, "user.create", "user", user_id, email=email, role=body.role)
     logger.info(f"Admin {admin.email} created user {email}")
 
     return {"message": "Konto skapat", "user_id": user_id}
 
+BULK_IMPORT_MAX_ROWS = 2000
+BULK_IMPORT_ROLES = ("member", "admin")
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
+
+def hash_pool() -> ProcessPoolExecutor:
+    """Process pool for bcrypt, created on first bulk import"""
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+    return _hash_pool
+
+def parse_bulk_rows(raw: bytes, content_type: str) -> List[dict]:
+    if "csv" in content_type:
+        reader = csv.DictReader(io.StringIO(raw.decode("utf-8-sig")))
+        return [{(k or "").strip().lower(): (v or "").strip() for k, v in row.items()} for row in reader]
+    data = json.loads(raw)
+    rows = data.get("users") if isinstance(data, dict) else data
+    if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+        raise ValueError("expected a list of users")
+    return rows
+
+def validate_bulk_row(row: dict) -> tuple:
+    """Normalized (email, name, password, role) or an error message"""
+    email = str(row.get("email") or "").lower().strip()
+    name = str(row.get("name") or "").strip()
+    password = str(row.get("password") or "")
+    role = str(row.get("role") or "member").strip().lower()
+    if "@" not in email:
+        return None, "Ogiltig e-postadress"
+    if not name:
+        return None, "Namn saknas"
+    if len(password) < 6:
+        return None, "Lösenordet måste vara minst 6 tecken"
+    if role not in BULK_IMPORT_ROLES:
+        return None, "Ogiltig roll"
+    return (email, name, password, role), None
+
+@api_router.post("/admin/users/bulk")
+async def admin_bulk_create_users(request: Request, dry_run: bool = False):
+    """Admin imports many member accounts from JSON or CSV.
+
+    Rows are all validated before anything is written; valid rows are then
+    hashed in a process pool and inserted in one unordered insert_many.
+    Returns one result per input row.
+    """
+    admin = await require_admin(request)
+
+    content_type = request.headers.get("content-type", "")
+    if "multipart/form-data" in content_type:
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None:
+            raise HTTPException(status_code=400, detail="Fil saknas")
+        raw = await upload.read()
+        content_type = "text/csv" if (upload.filename or "").endswith(".csv") else "application/json"
+    else:
+        raw = await request.body()
+
+    try:
+        rows = parse_bulk_rows(raw, content_type)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Kunde inte läsa importfilen: {e}")
+    if len(rows) > BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(status_code=400, detail=f"Högst {BULK_IMPORT_MAX_ROWS} rader per import")
+
+    results: List[dict] = []
+    valid: Dict[int, tuple] = {}
+    seen_emails = set()
+    for index, row in enumerate(rows):
+        parsed, error = validate_bulk_row(row)
+        email = parsed[0] if parsed else str(row.get("email") or "")
+        result = {"row": index + 1, "email": email}
+        if error:
+            result.update(status="invalid", detail=error)
+        elif email in seen_emails:
+            result.update(status="duplicate", detail="E-postadressen förekommer flera gånger i filen")
+        else:
+            seen_emails.add(email)
+            valid[index] = parsed
+        results.append(result)
+
+    existing = {
+        u["email"] async for u in db.users.find({"email": {"$in": list(seen_emails)}}, {"_id": 0, "email": 1})
+    } if seen_emails else set()
+    for index in [i for i, parsed in valid.items() if parsed[0] in existing]:
+        results[index].update(status="exists", detail="Användaren finns redan")
+        del valid[index]
+
+    if dry_run or not valid:
+        for index in valid:
+            results[index]["status"] = "valid"
+        return {"dry_run": dry_run, "created": 0, "results": results}
+
+    loop = asyncio.get_running_loop()
+    indexes = list(valid)
+    hashes = await asyncio.gather(*[
+        loop.run_in_executor(hash_pool(), hash_password, valid[i][2]) for i in indexes
+    ])
+    docs = [new_member_doc(valid[i][0], valid[i][1], pw_hash, valid[i][3]) for i, pw_hash in zip(indexes, hashes)]
+
+    failed_positions: Dict[int, dict] = {}
+    try:
+        await db.users.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        for error in e.details.get("writeErrors", []):
+            failed_positions[error["index"]] = error
+
+    created = 0
+    for position, (index, doc) in enumerate(zip(indexes, docs)):
+        error = failed_positions.get(position)
+        if error and error.get("code") == 11000:
+            # Registered between the lookup above and the insert
+            results[index].update(status="exists", detail="Användaren finns redan")
+        elif error:
+            results[index].update(status="error", detail=error.get("errmsg", ""))
+        else:
+            results[index].update(status="created", user_id=doc["user_id"])
+            created += 1
+
+    if created:
+        audit_log.record(request, admin, "user.bulk_create", "user", None, created=created,
+                         user_ids=[r["user_id"] for r in results if r.get("status") == "created"])
+    logger.info(f"Admin {admin.email} bulk imported {created} of {len(rows)} users")
+    return {"dry_run": False, "created": created, "results": results}
+
 @api_router.get("/admin/users")
 async def admin_list_users(request: Request):
     """Admin lists all users"""
     await require_admin(request)
-    users = await db.users.find({}, {"_id": 0, "password_hash": 0}).to_list(1000)
-    return users
+    return StreamingResponse(stream_export("users", "json"), media_type="application/json")
+
+# ==================== STREAMING EXPORTS ====================
+
+EXPORT_BATCH_SIZE = 200
+
+# projection and index-backed sort per exportable collection
+EXPORT_COLLECTIONS = {
+    "users": ({"_id": 0, "password_hash": 0, "calendar_feed_token": 0}, ("email", 1)),
+    "events": ({"_id": 0}, ("start_time", 1)),
+    "news": ({"_id": 0}, ("publish_date", -1)),
+}
+
+ROSTER_CSV_FIELDS = ["user_id", "email", "name", "role", "phone", "auth_type", "created_at"]
+
+EXPORT_MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+def json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def csv_row(doc: dict) -> str:
+    buffer = io.StringIO()
+    row = [doc.get(field) for field in ROSTER_CSV_FIELDS]
+    csv.writer(buffer).writerow(
+        [v.isoformat() if isinstance(v, datetime) else ("" if v is None else v) for v in row]
+    )
+    return buffer.getvalue()
+
+async def stream_export(collection: str, fmt: str):
+    """Yield a collection as JSON array, NDJSON or CSV, one cursor batch per chunk.
+
+    Only one batch of documents is held in memory at a time.
+    """
+    projection, (sort_field, direction) = EXPORT_COLLECTIONS[collection]
+    query = NOT_DELETED if collection in ("events", "news") else {}
+    cursor = db[collection].find(query, projection).sort(sort_field, direction).batch_size(EXPORT_BATCH_SIZE)
+
+    if fmt == "json":
+        yield "["
+    elif fmt == "csv":
+        yield ",".join(ROSTER_CSV_FIELDS) + "\r\n"
+
+    chunk: List[str] = []
+    first = True
+    async for doc in cursor:
+        if fmt == "csv":
+            chunk.append(csv_row(doc))
+        else:
+            line = json.dumps(doc, default=json_default, ensure_ascii=False)
+            if fmt == "ndjson":
+                chunk.append(line + "\n")
+            else:
+                chunk.append(line if first else "," + line)
+        first = False
+        if len(chunk) >= EXPORT_BATCH_SIZE:
+            yield "".join(chunk)
+            chunk = []
+
+    if chunk:
+        yield "".join(chunk)
+    if fmt == "json":
+        yield "]"
+
+@api_router.get("/admin/export/{collection}")
+async def admin_export(collection: str, request: Request, format: str = "ndjson"):
+    """Admin streams a full collection export (users, events or news)"""
+    admin = await require_admin(request)
+
+    if collection not in EXPORT_COLLECTIONS:
+        raise HTTPException(status_code=404, detail="Okänd export")
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Formatet måste vara json, ndjson eller csv")
+    if format == "csv" and collection != "users":
+        raise HTTPException(status_code=400, detail="CSV-export finns bara för medlemsregistret")
+
+    extension = "json" if format == "json" else format
+    logger.info(f"Admin {admin.email} exported {collection} as {format}")
+    return StreamingResponse(
+        stream_export(collection, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=borka-{collection}.{extension}"}
+    )
 
 @api_router.delete("/admin/users/{user_id}")
 async def admin_delete_user(user_id: str, request: Request):
@@ -664,31 +1558,836 @@ async def admin_delete_user(user_id: str, request: Request):
     if user["user_id"] == admin.user_id:
         raise HTTPException(status_code=400, detail="Du kan inte ta bort dig själv")
     await db.users.delete_one({"user_id": user_id})
+    while row := await db.event_attendance.find_one_and_delete({"user_id": user_id}, projection={"_id": 0}):
+        await remove_attendance(row)
     await db.user_sessions.delete_many({"user_id": user_id})
+    await db.session_sets.delete_one({"_id": user_id})
+    await revocations.revoke("user", user_id, datetime.now(timezone.utc) + SESSION_TTL)
+    audit_log.record(request, admin, "user.delete", "user", user_id, email=user["email"])
     logger.info(f"Admin {admin.email} deleted user {user_id}")
     return {"message": "Användaren borttagen"}
 
+@api_router.get("/admin/users/{user_id}/sessions")
+async def admin_list_sessions(user_id: str, request: Request):
+    """Admin lists a user's active sessions (devices)"""
+    await require_admin(request)
+    sessions = await db.user_sessions.find(
+        {"user_id": user_id, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+        {"_id": 0}
+    ).sort("created_at", -1).to_list(MAX_SESSIONS_PER_USER * 2)
+    return [
+        {
+            "session_id": session_public_id(s["session_token"]),
+            "user_agent": s.get("user_agent"),
+            "created_at": s["created_at"],
+            "expires_at": s["expires_at"],
+        }
+        for s in sessions
+    ]
+
+@api_router.delete("/admin/users/{user_id}/sessions")
+async def admin_revoke_all_sessions(user_id: str, request: Request):
+    """Admin signs a user out on every device"""
+    admin = await require_admin(request)
+    tokens = [s["session_token"] async for s in db.user_sessions.find({"user_id": user_id}, {"session_token": 1})]
+    await end_sessions(user_id, tokens)
+    audit_log.record(request, admin, "user.revoke_sessions", "user", user_id, revoked=len(tokens))
+    logger.info(f"Admin {admin.email} revoked all sessions of {user_id}")
+    return {"message": "Alla sessioner avslutade", "revoked": len(tokens)}
+
+@api_router.delete("/admin/users/{user_id}/sessions/{session_id}")
+async def admin_revoke_session(user_id: str, session_id: str, request: Request):
+    """Admin signs a user out on one device"""
+    admin = await require_admin(request)
+    async for s in db.user_sessions.find({"user_id": user_id}, {"session_token": 1}):
+        if session_public_id(s["session_token"]) == session_id:
+            await end_sessions(user_id, [s["session_token"]])
+            audit_log.record(request, admin, "user.revoke_sessions", "user", user_id, session_id=session_id)
+            logger.info(f"Admin {admin.email} revoked session {session_id} of {user_id}")
+            return {"message": "Sessionen avslutad"}
+    raise HTTPException(status_code=404, detail="Sessionen hittades inte")
+
+# ==================== AUDIT LOG ====================
+
+# Who did what to which document. Entries are buffered in memory and written
+# with one insert_many every AUDIT_FLUSH_MS or AUDIT_BATCH_SIZE entries, so
+# auditing never adds a database round trip to the admin request itself.
+AUDIT_FLUSH_SECONDS = int(os.environ.get("AUDIT_FLUSH_MS", "500")) / 1000
+AUDIT_BATCH_SIZE = int(os.environ.get("AUDIT_BATCH_SIZE", "100"))
+# Entries are dropped by a TTL index on "at"
+AUDIT_RETENTION_DAYS = int(os.environ.get("AUDIT_RETENTION_DAYS", "365"))
+# A database outage must not grow the buffer without bound
+AUDIT_MAX_PENDING = 10000
+AUDIT_PAGE_LIMIT = 200
+
+def same_stored_value(stored, new) -> bool:
+    """Whether a value read back from MongoDB equals one about to be written"""
+    if isinstance(stored, datetime) and isinstance(new, datetime):
+        # stored datetimes come back naive and truncated to milliseconds
+        return as_utc(stored) == as_utc(new).replace(microsecond=new.microsecond // 1000 * 1000)
+    return stored == new
+
+def audit_changes(before: dict, after: dict) -> dict:
+    """{field: {"from": old, "to": new}} for the fields an update actually changed"""
+    return {
+        field: {"from": before.get(field), "to": value}
+        for field, value in after.items()
+        if field != "updated_at" and not same_stored_value(before.get(field), value)
+    }
+
+class AuditLog:
+    def __init__(self):
+        self.pending: List[dict] = []
+        self.wakeup = asyncio.Event()
+        self.dropped = 0
+
+    def record(self, request: Request, actor: "Principal", action: str, target_type: str,
+               target_id: Optional[str], changes: Optional[dict] = None, **details):
+        """Queue an entry; action is "<target_type>.<verb>", e.g. "event.update" """
+        if len(self.pending) >= AUDIT_MAX_PENDING:
+            self.dropped += 1
+            return
+        self.pending.append({
+            "_id": ObjectId(),  # also the pagination key: ordered by creation time
+            "at": datetime.now(timezone.utc),
+            "actor_id": actor.user_id,
+            "actor_email": actor.email,
+            "action": action,
+            "target_type": target_type,
+            "target_id": target_id,
+            "changes": changes or None,
+            "details": details or None,
+            "ip": client_ip(request),
+        })
+        if len(self.pending) >= AUDIT_BATCH_SIZE:
+            self.wakeup.set()
+
+    async def flush(self):
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        try:
+            await db.audit_log.insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            # Entries already written (a retried batch) are duplicates; anything else is lost
+            failed = [err for err in e.details.get("writeErrors", []) if err.get("code") != 11000]
+            if failed:
+                logger.error(f"Audit log flush lost {len(failed)} entries: {failed[0].get('errmsg')}")
+        except Exception as e:
+            logger.error(f"Audit log flush failed, retrying {len(batch)} entries: {e}")
+            self.pending = (batch + self.pending)[:AUDIT_MAX_PENDING]
+        if self.dropped:
+            logger.error(f"Audit log buffer full, dropped {self.dropped} entries")
+            self.dropped = 0
+
+    async def flush_forever(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=AUDIT_FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            await self.flush()
+
+audit_log = AuditLog()
+
+@api_router.get("/admin/audit")
+async def get_audit_log(
+    request: Request,
+    target_type: Optional[str] = None,
+    target_id: Optional[str] = None,
+    actor_id: Optional[str] = None,
+    action: Optional[str] = None,
+    before: Optional[str] = None,
+    limit: int = 50,
+):
+    """Admin audit trail, newest first.
+
+    Pass the returned next_before as before= to get the next page; each page
+    is one range scan on an index ending in _id.
+    """
+    await require_admin(request)
+    query: Dict[str, Any] = {}
+    if target_id:
+        # target_id is only indexed behind target_type
+        if not target_type:
+            raise HTTPException(status_code=400, detail="target_id kräver target_type")
+        query.update(target_type=target_type, target_id=target_id)
+    elif target_type:
+        query["target_type"] = target_type
+    if actor_id:
+        query["actor_id"] = actor_id
+    if action:
+        query["action"] = action
+    if before:
+        if not ObjectId.is_valid(before):
+            raise HTTPException(status_code=400, detail="Ogiltig sidmarkör")
+        query["_id"] = {"$lt": ObjectId(before)}
+    limit = max(1, min(limit, AUDIT_PAGE_LIMIT))
+
+    entries = await db.audit_log.find(query).sort("_id", -1).limit(limit).to_list(None)
+    for entry in entries:
+        entry["id"] = str(entry.pop("_id"))
+    return {
+        "entries": entries,
+        "next_before": entries[-1]["id"] if len(entries) == limit else None,
+    }
+
+# ==================== CHANGE FEED ====================
+
+# Bumped by every write to a collection. Derived data (ICS renders, search
+# index) is keyed on it, so an edit makes older copies unreachable without
+# explicit invalidation.
+data_versions: Dict[str, int] = {"events": 0, "news": 0, "categories": 0}
+
+def bump_data_version(collection: str) -> None:
+    data_versions[collection] = data_versions.get(collection, 0) + 1
+
+SSE_HEARTBEAT_SECONDS = 15
+SSE_RETRY_MS = 3000
+
+class BroadcastHub:
+    """Fans change deltas out to connected SSE clients.
+
+    Every client has a bounded queue. A client that falls behind is dropped
+    rather than buffered without limit; it reconnects with Last-Event-ID and
+    catches up from the ring buffer of recent messages.
+
+    Message ids are "<stream id>-<number>". The numbering is per process, so
+    an id from another worker or from before a restart can't be resumed
+    from and gets a reset instead.
+    """
+
+    def __init__(self, buffer_size: int = 500, queue_size: int = 100):
+        self.stream_id = uuid.uuid4().hex[:12]
+        self.next_id = 1
+        self.buffer: deque = deque(maxlen=buffer_size)
+        self.queue_size = queue_size
+        self.clients: set = set()
+
+    def publish(self, event: str, data: dict) -> None:
+        message = (self.next_id, f"{self.stream_id}-{self.next_id}", event,
+                   json.dumps(data, default=json_default, ensure_ascii=False))
+        self.next_id += 1
+        self.buffer.append(message)
+        for queue in list(self.clients):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self.clients.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)  # tells the stream to close
+
+    def subscribe(self, last_event_id: Optional[str]) -> tuple:
+        """Register a client; returns (queue, backlog), backlog None if it can't resume"""
+        backlog: Optional[list] = []
+        if last_event_id is not None:
+            stream_id, _, number = last_event_id.rpartition("-")
+            oldest = self.buffer[0][0] if self.buffer else self.next_id
+            if stream_id != self.stream_id or not number.isdigit():
+                # Another worker's numbering, or from before a restart
+                backlog = None
+            elif int(number) >= self.next_id or int(number) < oldest - 1:
+                # The client missed more than we keep
+                backlog = None
+            else:
+                backlog = [m for m in self.buffer if m[0] > int(number)]
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.clients.add(queue)
+        return queue, backlog
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self.clients.discard(queue)
+
+change_hub = BroadcastHub()
+
+# Capped log of every mutation, keyed by a global sequence number. Delete
+# entries double as tombstones for /api/sync.
+CHANGES_MAX_ENTRIES = 10000
+CHANGES_MAX_BYTES = 5 * 1024 * 1024
+
+async def ensure_changes_collection():
+    if "changes" in await db.list_collection_names():
+        return
+    try:
+        await db.create_collection("changes", capped=True, size=CHANGES_MAX_BYTES, max=CHANGES_MAX_ENTRIES)
+    except CollectionInvalid:
+        pass  # created concurrently by another worker
+    except NotImplementedError:
+        # mongomock stand-in can't cap; the log simply grows in tests
+        logger.warning("Capped collections unsupported, changes log is uncapped")
+
+async def next_change_seq(count: int = 1) -> int:
+    """Reserve `count` sequence numbers; returns the last one"""
+    counter = await db.counters.find_one_and_update(
+        {"_id": "changes"},
+        {"$inc": {"seq": count}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return counter["seq"]
+
+async def record_changes(changes: List[tuple]) -> None:
+    """Record (collection, op, doc_id, doc) writes after they succeeded.
+
+    The sequence numbers are taken after the writes, so any change up to a
+    counter value is already visible in its collection.
+    """
+    if not changes:
+        return
+    last_seq = await next_change_seq(len(changes))
+    first_seq = last_seq - len(changes) + 1
+    now = datetime.now(timezone.utc)
+    await db.changes.insert_many([
+        {"seq": first_seq + i, "collection": collection, "op": op, "id": doc_id, "at": now, "worker": WORKER_ID}
+        for i, (collection, op, doc_id, _) in enumerate(changes)
+    ])
+    for collection in {change[0] for change in changes}:
+        bump_data_version(collection)
+    for i, (collection, op, doc_id, doc) in enumerate(changes):
+        change_hub.publish("change", {"seq": first_seq + i, "collection": collection, "op": op, "id": doc_id, "doc": doc})
+
+async def record_change(collection: str, op: str, doc_id: str, doc: Optional[dict] = None) -> None:
+    """Called by every CRUD handler after a successful write"""
+    await record_changes([(collection, op, doc_id, doc)])
+
+HEADCOUNT_FIELDS = ("attendee_count", "waitlist_count", "version")
+
+async def record_headcount_change(event: dict) -> None:
+    """Record an RSVP headcount change without moving the events data version.
+
+    Only the timeline shows headcounts, so it is patched in place rather
+    than every derived cache being rebuilt on each sign-up. The entry
+    carries the counts so other workers can do the same.
+    """
+    seq = await next_change_seq()
+    counts = {field: event.get(field, 0) for field in HEADCOUNT_FIELDS}
+    # Members can still leave a trashed event; clients must not get it back
+    op, doc = ("delete", None) if event.get("deleted_at") else ("update", event)
+    await db.changes.insert_one({
+        "seq": seq, "collection": "events", "op": op, "id": event["id"],
+        "at": datetime.now(timezone.utc), "worker": WORKER_ID, "counts": counts,
+    })
+    event_timeline.patch_counts(event["id"], counts)
+    change_hub.publish("change", {"seq": seq, "collection": "events", "op": op, "id": event["id"], "doc": doc})
+
+def format_sse(message: tuple) -> str:
+    _, message_id, event, data = message
+    return f"id: {message_id}\nevent: {event}\ndata: {data}\n\n"
+
+async def sse_stream(request: Request, queue: asyncio.Queue, backlog: Optional[list]):
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        if backlog is None:
+            yield "event: reset\ndata: {}\n\n"
+        else:
+            for message in backlog:
+                yield format_sse(message)
+
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keepalive\n\n"
+                continue
+            if message is None:
+                break
+            yield format_sse(message)
+    finally:
+        change_hub.unsubscribe(queue)
+
+@api_router.get("/stream")
+async def stream_changes(request: Request):
+    """Server-sent events with create/update/delete deltas for events and news"""
+    last_event_id = request.headers.get("Last-Event-ID") or request.query_params.get("last_event_id") or None
+    queue, backlog = change_hub.subscribe(last_event_id)
+    return StreamingResponse(
+        sse_stream(request, queue, backlog),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+SYNC_COLLECTIONS = ("events", "news", "categories")
+SYNC_MAX_CHANGES = 1000
+# A missing sequence number normally means its writer hasn't inserted the
+# change yet. Past this age the writer is assumed dead and the gap skipped.
+SYNC_GAP_GRACE = timedelta(seconds=10)
+
+async def full_sync_payload(token: int) -> dict:
+    events, news, categories = await asyncio.gather(
+        db.events.find({**NOT_DELETED, "start_time": {"$gte": datetime.now(timezone.utc)}}, {"_id": 0}).sort("start_time", 1).to_list(100),
+        db.news.find(NOT_DELETED, {"_id": 0}).sort("publish_date", -1).to_list(100),
+        db.categories.find({}, {"_id": 0}).to_list(20),
+    )
+    return {
+        "token": str(token),
+        "full": True,
+        "has_more": False,
+        "events": events,
+        "news": news,
+        "categories": categories,
+        "deleted": {name: [] for name in SYNC_COLLECTIONS},
+    }
+
+@api_router.get("/sync")
+async def sync(since: Optional[str] = None):
+    """Return events, news and categories changed since a sync token.
+
+    Without a usable token (first sync, or the change log no longer reaches
+    back that far) the response is a full snapshot with "full": true.
+    """
+    counter = await db.counters.find_one({"_id": "changes"})
+    current = counter["seq"] if counter else 0
+
+    since_seq = int(since) if since and since.isdigit() else None
+    if since_seq is None or since_seq > current:
+        return await full_sync_payload(current)
+
+    oldest = await db.changes.find_one({}, {"_id": 0, "seq": 1}, sort=[("seq", 1)])
+    if oldest and since_seq < oldest["seq"] - 1:
+        return await full_sync_payload(current)
+
+    changes = await db.changes.find(
+        {"seq": {"$gt": since_seq}}, {"_id": 0}
+    ).sort("seq", 1).to_list(SYNC_MAX_CHANGES)
+
+    # Only hand out a token covering a gap-free run of sequence numbers,
+    # otherwise a change still being written would be skipped forever
+    token = since_seq
+    latest: Dict[str, Dict[str, str]] = {name: {} for name in SYNC_COLLECTIONS}
+    now = datetime.now(timezone.utc)
+    for change in changes:
+        if change["seq"] != token + 1:
+            at = change["at"] if change["at"].tzinfo else change["at"].replace(tzinfo=timezone.utc)
+            if now - at < SYNC_GAP_GRACE:
+                break
+        token = change["seq"]
+        latest.setdefault(change["collection"], {})[change["id"]] = change["op"]
+
+    payload = {
+        "token": str(token),
+        "full": False,
+        "has_more": len(changes) == SYNC_MAX_CHANGES,
+        "deleted": {},
+    }
+    for name in SYNC_COLLECTIONS:
+        ops = latest.get(name, {})
+        live_ids = [doc_id for doc_id, op in ops.items() if op != "delete"]
+        deleted = [doc_id for doc_id, op in ops.items() if op == "delete"]
+        docs = await db[name].find({"id": {"$in": live_ids}}, {"_id": 0}).to_list(None) if live_ids else []
+        # A create/update whose document has since gone to the trash (its
+        # delete lies past this token) is reported as a removal straight away
+        payload[name] = [doc for doc in docs if not doc.get("deleted_at")]
+        deleted += [doc["id"] for doc in docs if doc.get("deleted_at")]
+        payload["deleted"][name] = deleted
+    return payload
+
+# ==================== WORKER COORDINATION ====================
+
+# Several uvicorn workers (or containers) can serve one database. Each
+# worker follows db.changes to invalidate its caches and feed its SSE
+# clients with writes made elsewhere, and background jobs run only on the
+# worker holding the leader lease.
+MULTI_WORKER = os.environ.get("MULTI_WORKER", "").lower() in ("1", "true", "yes") or \
+    int(os.environ.get("WEB_CONCURRENCY", "1")) > 1
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+LEASE_TTL_SECONDS = int(os.environ.get("LEASE_TTL_SECONDS", "30"))
+CHANGE_POLL_SECONDS = int(os.environ.get("CHANGE_POLL_MS", "500")) / 1000
+
+class MongoLease:
+    """A named lease in db.leases, held by one worker until it expires.
+
+    Expiry uses the local clock, so hosts sharing a database need clocks
+    within a few seconds of each other (well under LEASE_TTL_SECONDS).
+    """
+
+    def __init__(self, name: str, ttl_seconds: int = LEASE_TTL_SECONDS):
+        self.name = name
+        self.ttl = ttl_seconds
+        self.held = False
+
+    async def try_acquire(self) -> bool:
+        """Take the lease if free or expired, or extend it if we hold it"""
+        now = datetime.now(timezone.utc)
+        try:
+            lease = await db.leases.find_one_and_update(
+                {"_id": self.name, "$or": [{"holder": WORKER_ID}, {"expires_at": {"$lte": now}}]},
+                {"$set": {"holder": WORKER_ID, "expires_at": now + timedelta(seconds=self.ttl), "renewed_at": now}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # Someone else holds it, so the upsert tried to insert a second lease
+            lease = None
+        self.held = bool(lease and lease["holder"] == WORKER_ID)
+        return self.held
+
+    async def release(self) -> None:
+        if self.held:
+            await db.leases.delete_one({"_id": self.name, "holder": WORKER_ID})
+            self.held = False
+
+leader_lease = MongoLease("leader")
+_leader_tasks: List[asyncio.Task] = []
+
+def start_leader_tasks():
+    """Jobs that must run on exactly one worker; each must be idempotent,
+    since a new leader runs them again"""
+    _leader_tasks.extend(run_in_background(job()) for job in LEADER_JOBS)
+
+def stop_leader_tasks():
+    for task in _leader_tasks:
+        task.cancel()
+    _leader_tasks.clear()
+
+async def lead_forever():
+    """Acquire and renew the leader lease, starting or stopping leader jobs"""
+    while True:
+        was_leader = leader_lease.held
+        try:
+            is_leader = await leader_lease.try_acquire()
+        except Exception as e:
+            logger.error(f"Leader lease renewal failed: {e}")
+            is_leader = leader_lease.held = False
+        if is_leader and not was_leader:
+            logger.info(f"Worker {WORKER_ID} is now the leader")
+            start_leader_tasks()
+        elif was_leader and not is_leader:
+            logger.warning(f"Worker {WORKER_ID} lost the leader lease")
+            stop_leader_tasks()
+        await asyncio.sleep(LEASE_TTL_SECONDS / 3)
+
+async def apply_remote_changes(after_seq: int) -> int:
+    """Apply changes other workers recorded after `after_seq`; returns the new position.
+
+    Like /sync, only a gap-free run of sequence numbers is consumed, so a
+    change whose seq is reserved but not yet inserted isn't skipped.
+    """
+    changes = await db.changes.find(
+        {"seq": {"$gt": after_seq}}, {"_id": 0}
+    ).sort("seq", 1).to_list(SYNC_MAX_CHANGES)
+
+    position = after_seq
+    remote = []
+    now = datetime.now(timezone.utc)
+    for change in changes:
+        if change["seq"] != position + 1:
+            at = change["at"] if change["at"].tzinfo else change["at"].replace(tzinfo=timezone.utc)
+            if now - at < SYNC_GAP_GRACE:
+                break
+        position = change["seq"]
+        if change.get("worker") != WORKER_ID:
+            remote.append(change)
+    if not remote:
+        return position
+
+    for collection in {change["collection"] for change in remote if "counts" not in change}:
+        bump_data_version(collection)
+    for change in remote:
+        if "counts" in change:
+            event_timeline.patch_counts(change["id"], change["counts"])
+
+    if change_hub.clients:
+        wanted: Dict[str, set] = {}
+        for change in remote:
+            if change["op"] != "delete":
+                wanted.setdefault(change["collection"], set()).add(change["id"])
+        docs = {}
+        for collection, ids in wanted.items():
+            async for doc in db[collection].find({"id": {"$in": list(ids)}, **NOT_DELETED}, {"_id": 0}):
+                docs[(collection, doc["id"])] = doc
+        for change in remote:
+            change_hub.publish("change", {
+                "seq": change["seq"], "collection": change["collection"], "op": change["op"],
+                "id": change["id"], "doc": docs.get((change["collection"], change["id"])),
+            })
+    return position
+
+async def follow_changes_forever():
+    counter = await db.counters.find_one({"_id": "changes"})
+    position = counter["seq"] if counter else 0
+    while True:
+        await asyncio.sleep(CHANGE_POLL_SECONDS)
+        try:
+            position = await apply_remote_changes(position)
+        except Exception as e:
+            logger.error(f"Change follower failed: {e}")
+
+# ==================== COMPRESSION ====================
+
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", "1024"))
+# Already compressed or binary payloads gain nothing from another pass
+UNCOMPRESSIBLE_TYPES = ("image/", "video/", "audio/", "font/woff", "application/zip",
+                        "application/gzip", "application/octet-stream", "application/pdf")
+# Streamed responses (SSE, exports) are passed through untouched
+
+def available_encodings() -> List[str]:
+    """Supported content codings, best first"""
+    return (["br"] if brotli else []) + (["zstd"] if zstandard else []) + ["gzip"]
+
+SUPPORTED_ENCODINGS = available_encodings()
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick our best coding the client accepts (q=0 excludes it)"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name:
+            accepted[name] = q
+    wildcard = accepted.get("*", 0.0)
+    candidates = [(accepted.get(enc, wildcard), -rank, enc) for rank, enc in enumerate(SUPPORTED_ENCODINGS)]
+    q, _, encoding = max(candidates)
+    return encoding if q > 0 else None
+
+def compress_bytes(body: bytes, encoding: str, best: bool = False) -> bytes:
+    """Fast levels per request; `best` for bodies that are compressed once and cached.
+
+    Even cached bodies are compressed on the event loop when first asked
+    for, and news lists can carry megabytes of inline images, so `best`
+    stays at levels that cost milliseconds rather than the maximums.
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=5 if best else 4)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=6 if best else 3).compress(body)
+    return gzip.compress(body, compresslevel=6 if best else 5, mtime=0)
+
+def compressible(content_type: str, size: int) -> bool:
+    content_type = content_type.lower()
+    return size >= COMPRESSION_MIN_BYTES and not content_type.startswith(UNCOMPRESSIBLE_TYPES)
+
+class CachedBody:
+    """Encoded response body plus its compressed variants, each built once"""
+    __slots__ = ("raw", "variants")
+
+    def __init__(self, raw: bytes):
+        self.raw = raw
+        self.variants: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        variant = self.variants.get(encoding)
+        if variant is None:
+            variant = self.variants[encoding] = compress_bytes(self.raw, encoding, best=True)
+        return variant
+
+def cached_body_response(request: Request, body: CachedBody, media_type: str, headers: Optional[dict] = None) -> Response:
+    """Response for a cached body in the coding the client asked for"""
+    headers = dict(headers or {})
+    headers["Vary"] = "Accept-Encoding"
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding and compressible(media_type, len(body.raw)):
+        variant = body.encoded(encoding)
+        if len(variant) < len(body.raw):
+            headers["Content-Encoding"] = encoding
+            return Response(content=variant, media_type=media_type, headers=headers)
+    return Response(content=body.raw, media_type=media_type, headers=headers)
+
+class CompressionMiddleware:
+    """Compress complete (non-streamed) responses in the negotiated coding.
+
+    Responses that already carry a Content-Encoding (the cached bodies
+    above) are left alone.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or not compressible(headers.get("content-type", ""), len(body))
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = compress_bytes(body, encoding)
+            headers.add_vary_header("Accept-Encoding")
+            if len(compressed) < len(body):
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(compressed))
+                body = compressed
+            await send(start)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+# ==================== RESPONSE CACHE ====================
+
+LIST_CACHE_MAX_ENTRIES = 64
+_list_cache: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (data version, valid until, body)
+
+def encode_json(content) -> bytes:
+    """orjson with the same datetime strings jsonable_encoder produces"""
+    return orjson.dumps(content, default=json_default)
+
+def json_bytes_response(body: bytes, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+async def cached_list_response(request: Request, key: tuple, collection: str, load) -> Response:
+    """Serve a list endpoint from pre-encoded bytes until `collection` changes"""
+    version = data_versions[collection]
+    entry = _list_cache.get(key)
+    if entry and entry[0] == version and (entry[1] is None or datetime.now(timezone.utc) < entry[1]):
+        _list_cache.move_to_end(key)
+        return cached_body_response(request, entry[2], "application/json")
+
+    docs = await load()
+    body = CachedBody(encode_json(docs))
+    # Stored under the version read before the query, so a write racing
+    # with the load just makes the next request reload
+    _list_cache[key] = (version, public_read_expiry(), body)
+    _list_cache.move_to_end(key)
+    while len(_list_cache) > LIST_CACHE_MAX_ENTRIES:
+        _list_cache.popitem(last=False)
+    return cached_body_response(request, body, "application/json")
+
 # ==================== EVENTS ENDPOINTS ====================
 
+EVENTS_LIST_LIMIT = 100
+EVENTS_RANGE_LIMIT = 500
+TIMELINE_SLICE_CACHE_ENTRIES = 128
+
+class EventTimeline:
+    """Every event sorted by start_time, per category, each one pre-encoded.
+
+    Rebuilt with one query when the events data version moves. Upcoming and
+    range listings are then a bisect over start times, and a listing is
+    cached by the slice it covers, so the moving "now" only produces a new
+    body once an event actually starts.
+    """
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self.expires_at: Optional[datetime] = None
+        self.starts: Dict[Optional[str], List[datetime]] = {}
+        self.encoded: Dict[Optional[str], List[bytes]] = {}
+        self.docs: Dict[str, dict] = {}
+        self.positions: Dict[Optional[str], Dict[str, int]] = {}
+        self.slices: "OrderedDict[tuple, CachedBody]" = OrderedDict()
+        self.lock = asyncio.Lock()
+        self.patched_during_load = False
+
+    async def refresh(self) -> None:
+        now = datetime.now(timezone.utc)
+        if self.version == data_versions["events"] and (self.expires_at is None or now < self.expires_at):
+            return
+        async with self.lock:
+            version = data_versions["events"]
+            if self.version == version and (self.expires_at is None or now < self.expires_at):
+                return
+            self.patched_during_load = False
+            docs = await public_reads().events.find(NOT_DELETED, {"_id": 0}).sort("start_time", 1).to_list(None)
+            starts: Dict[Optional[str], List[datetime]] = {None: []}
+            encoded: Dict[Optional[str], List[bytes]] = {None: []}
+            positions: Dict[Optional[str], Dict[str, int]] = {None: {}}
+            for doc in docs:
+                start, body = as_utc(doc["start_time"]), encode_json(doc)
+                for key in (None, doc.get("category")):
+                    positions.setdefault(key, {})[doc["id"]] = len(encoded.setdefault(key, []))
+                    starts.setdefault(key, []).append(start)
+                    encoded[key].append(body)
+            self.starts, self.encoded, self.positions = starts, encoded, positions
+            self.docs = {doc["id"]: doc for doc in docs}
+            self.slices = OrderedDict()
+            # A headcount patched while the query ran may be missing from
+            # what it returned; load again on the next request
+            self.version = None if self.patched_during_load else version
+            self.expires_at = public_read_expiry()
+
+    def patch_counts(self, event_id: str, counts: dict) -> None:
+        """Apply an RSVP headcount change to the loaded events in place"""
+        if self.lock.locked():
+            self.patched_during_load = True
+        doc = self.docs.get(event_id)
+        # Versions order the patches, which may arrive out of order
+        if doc is None or doc.get("version", 1) >= counts["version"]:
+            return
+        doc.update(counts)
+        body = encode_json(doc)
+        for key in (None, doc.get("category")):
+            self.encoded[key][self.positions[key][event_id]] = body
+        self.slices = OrderedDict()
+
+    def listing(self, category: Optional[str], start: Optional[datetime], end: Optional[datetime], limit: int) -> CachedBody:
+        starts = self.starts.get(category, [])
+        lo = bisect.bisect_left(starts, start) if start else 0
+        hi = bisect.bisect_left(starts, end) if end else len(starts)
+        hi = max(lo, min(hi, lo + limit))
+        key = (category, lo, hi)
+        body = self.slices.get(key)
+        if body is None:
+            body = CachedBody(b"[" + b",".join(self.encoded.get(category, [])[lo:hi]) + b"]")
+            self.slices[key] = body
+            while len(self.slices) > TIMELINE_SLICE_CACHE_ENTRIES:
+                self.slices.popitem(last=False)
+        else:
+            self.slices.move_to_end(key)
+        return body
+
+event_timeline = EventTimeline()
+
 @api_router.get("/events")
-async def get_events(category: Optional[str] = None, upcoming: bool = True):
-    """Get all events, optionally filtered"""
-    query = {}
-    if category and category != "all":
-        query["category"] = category
-    if upcoming:
-        query["start_time"] = {"$gte": datetime.now(timezone.utc)}
-    
-    events = await db.events.find(query, {"_id": 0}).sort("start_time", 1).to_list(100)
-    return events
+async def get_events(
+    request: Request,
+    category: Optional[str] = None,
+    upcoming: bool = True,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """Get events sorted by start time, optionally filtered by category and
+    by a start-time range [start, end); upcoming=true starts the range at now"""
+    if category == "all":
+        category = None
+    if start is None and upcoming:
+        start = datetime.now(timezone.utc)
+    start = as_utc(start) if start else None
+    end = as_utc(end) if end else None
+    ranged = end is not None or request.query_params.get("start") is not None
+
+    await event_timeline.refresh()
+    body = event_timeline.listing(category, start, end, EVENTS_RANGE_LIMIT if ranged else EVENTS_LIST_LIMIT)
+    return cached_body_response(request, body, "application/json")
 
 @api_router.get("/events/{event_id}")
-async def get_event(event_id: str):
+async def get_event(request: Request, event_id: str):
     """Get single event"""
-    event = await db.events.find_one({"id": event_id}, {"_id": 0})
+    event = await db.events.find_one({"id": event_id, **NOT_DELETED}, {"_id": 0})
     if not event:
         raise HTTPException(status_code=404, detail="Event hittades inte")
-    return event
+    return versioned_response(request, event)
 
 @api_router.post("/events")
 async def create_event(request: Request, event: EventCreate):
@@ -699,65 +2398,313 @@ async def create_event(request: Request, event: EventCreate):
         **event.model_dump(),
         created_by=user.user_id
     )
+    doc = event_doc.model_dump()
     
-    await db.events.insert_one(event_doc.model_dump())
+    await db.events.insert_one(dict(doc))
+    await record_change("events", "create", doc["id"], doc)
+    audit_log.record(request, user, "event.create", "event", doc["id"], title=doc["title"])
     
     # Send push notifications to subscribed users
     await send_new_event_notifications(event_doc)
     
-    return event_doc.model_dump()
+    return json_bytes_response(encode_json(doc))
 
 @api_router.put("/events/{event_id}")
 async def update_event(request: Request, event_id: str, update: EventUpdate):
-    """Update event (admin only)"""
+    """Update event (admin only).
+
+    Send If-Match with the version (ETag) the edit is based on to have
+    overlapping concurrent edits rejected with 409 instead of overwritten.
+    """
     user = await require_admin(request)
     
-    existing = await db.events.find_one({"id": event_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Event hittades inte")
-    
-    update_data = {k: v for k, v in update.model_dump().items() if v is not None}
+    update_data = update.update_fields()
     update_data["updated_at"] = datetime.now(timezone.utc)
     
-    await db.events.update_one(
-        {"id": event_id},
-        {"$set": update_data}
-    )
+    try:
+        existing, updated = await versioned_update("events", event_id, update_data, if_match_version(request))
+    except VersionConflict as conflict:
+        return conflict.response("Eventet har ändrats av någon annan")
+    if existing is None:
+        raise HTTPException(status_code=404, detail="Event hittades inte")
+    changes = audit_changes(existing, update_data)
+    await record_change("events", "update", event_id, updated)
+    audit_log.record(request, user, "event.update", "event", event_id, changes)
+    if "capacity" in changes and await promote_waitlist(event_id):
+        updated = await db.events.find_one({"id": event_id}, {"_id": 0})
     
     # Send update notifications if time/location changed
-    if "start_time" in update_data or "location" in update_data:
-        updated_event = await db.events.find_one({"id": event_id}, {"_id": 0})
-        await send_event_update_notifications(Event(**updated_event))
+    if "start_time" in changes or "location" in changes:
+        await send_event_update_notifications(Event(**updated))
     
-    updated = await db.events.find_one({"id": event_id}, {"_id": 0})
-    return updated
+    return versioned_response(request, updated)
 
 @api_router.delete("/events/{event_id}")
 async def delete_event(request: Request, event_id: str):
-    """Delete event (admin only)"""
-    await require_admin(request)
+    """Move an event to the trash (admin only); undo with POST /events/{id}/restore"""
+    user = await require_admin(request)
     
-    result = await db.events.delete_one({"id": event_id})
-    if result.deleted_count == 0:
+    event = await move_to_trash(request, "events", event_id, user)
+    if event is None:
         raise HTTPException(status_code=404, detail="Event hittades inte")
     
-    return {"message": "Event borttaget"}
+    return {"message": "Event borttaget", "id": event_id, "deleted_at": event["deleted_at"]}
+
+@api_router.post("/events/{event_id}/restore")
+async def restore_event(request: Request, event_id: str):
+    """Take an event back out of the trash (admin only)"""
+    user = await require_admin(request)
+    event = await restore_from_trash("events", event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail="Eventet finns inte i papperskorgen")
+    audit_log.record(request, user, "event.restore", "event", event_id, title=event["title"])
+    # Seats given back while it was in the trash go to the queue now
+    if event.get("waitlist_count", 0) > 0 and await promote_waitlist(event_id):
+        event = await db.events.find_one({"id": event_id}, {"_id": 0})
+    return json_bytes_response(encode_json(event))
+
+# ==================== EVENT RSVP ====================
+
+# Headcounts live on the event document (attendee_count, waitlist_count) and
+# change only through $inc, so listings show them without aggregating.
+# event_attendance holds one row per member and event:
+#   status "joining"    - inserted, seat not decided yet (not counted)
+#          "going"      - holds one of the event's seats
+#          "waitlisted" - queued by (waitlisted_at, _id)
+# A counter is always bumped before a row takes the matching status and after
+# it gives it up, so the counters never undercount the rows and a seat can't
+# be handed out twice.
+
+class RsvpRequest(BaseModel):
+    waitlist: bool = True  # join the waitlist when the event is full
+
+WAITLIST_ORDER = [("waitlisted_at", 1), ("_id", 1)]
+
+def has_free_seat() -> dict:
+    """Filter matching events with unlimited capacity or a seat left"""
+    return {"$or": [
+        {"capacity": None},
+        {"$expr": {"$lt": [{"$ifNull": ["$attendee_count", 0]}, "$capacity"]}},
+    ]}
+
+def has_open_seat() -> dict:
+    """A free seat that no waitlisted member is first in line for"""
+    return {"$and": [has_free_seat(), {"waitlist_count": {"$not": {"$gt": 0}}}], **NOT_DELETED}
+
+async def bump_event_counts(event_id: str, going: int = 0, waitlisted: int = 0, extra_filter: Optional[dict] = None) -> Optional[dict]:
+    """Atomically adjust an event's headcounts and record the change"""
+    inc = {k: v for k, v in (("attendee_count", going), ("waitlist_count", waitlisted)) if v}
+    inc["version"] = 1
+    event = await db.events.find_one_and_update(
+        {"id": event_id, **(extra_filter or {})},
+        {"$inc": inc},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+    if event is not None:
+        await record_headcount_change(event)
+    return event
+
+async def waitlist_position(row: dict) -> int:
+    """1-based place in the queue, counted on the (event_id, status, waitlisted_at) index"""
+    return await db.event_attendance.count_documents({
+        "event_id": row["event_id"],
+        "status": "waitlisted",
+        "$or": [
+            {"waitlisted_at": {"$lt": row["waitlisted_at"]}},
+            {"waitlisted_at": row["waitlisted_at"], "_id": {"$lt": row["_id"]}},
+        ],
+    }) + 1
+
+async def promote_waitlist(event_id: str) -> List[str]:
+    """Move waitlisted members into free seats, first in line first.
+
+    Each round reserves a seat on the event before taking the head of the
+    queue, so concurrent promotions (several cancellations at once, a
+    capacity increase) never hand out more seats than exist. Promoted
+    members are notified in batches. Returns the promoted user ids.
+    """
+    promoted: List[str] = []
+    while True:
+        reserved = await db.events.find_one_and_update(
+            {"id": event_id, "waitlist_count": {"$gt": 0}, **has_free_seat(), **NOT_DELETED},
+            {"$inc": {"attendee_count": 1, "version": 1}},
+            projection={"_id": 0, "id": 1},
+        )
+        if reserved is None:
+            break
+        row = await db.event_attendance.find_one_and_update(
+            {"event_id": event_id, "status": "waitlisted"},
+            {"$set": {"status": "going", "promoted_at": datetime.now(timezone.utc)}},
+            sort=WAITLIST_ORDER,
+            projection={"_id": 0, "user_id": 1},
+        )
+        if row is not None:
+            await db.events.update_one({"id": event_id}, {"$inc": {"waitlist_count": -1, "version": 1}})
+            promoted.append(row["user_id"])
+            continue
+        # Nobody queued right now (a waitlisted member is mid-join or
+        # mid-leave). Hand the seat back; if someone got queued while we held
+        # it, their own promotion found no seat, so go round again for them.
+        await db.events.update_one({"id": event_id}, {"$inc": {"attendee_count": -1, "version": 1}})
+        if not await db.event_attendance.find_one({"event_id": event_id, "status": "waitlisted"}, {"_id": 1}):
+            break
+
+    if promoted:
+        event = await db.events.find_one({"id": event_id}, {"_id": 0})
+        await record_headcount_change(event)
+        queue_promotion_notices(event_id, promoted)
+        logger.info(f"Promoted {len(promoted)} from the waitlist of event {event_id}")
+    return promoted
+
+async def rsvp_response(event_id: str, row: Optional[dict], event: Optional[dict] = None) -> dict:
+    if event is None:
+        event = await db.events.find_one(
+            {"id": event_id}, {"_id": 0, "capacity": 1, "attendee_count": 1, "waitlist_count": 1}
+        ) or {}
+    status = row["status"] if row else "none"
+    return {
+        "event_id": event_id,
+        "status": "none" if status == "joining" else status,
+        "waitlist_position": await waitlist_position(row) if status == "waitlisted" else None,
+        "capacity": event.get("capacity"),
+        "attendee_count": event.get("attendee_count", 0),
+        "waitlist_count": event.get("waitlist_count", 0),
+    }
+
+async def remove_attendance(row: dict) -> Optional[dict]:
+    """Give back the seat or waitlist spot of a deleted attendance row"""
+    if row["status"] == "going":
+        event = await bump_event_counts(row["event_id"], going=-1)
+        # A trashed event's queue waits for a restore
+        if event and not event.get("deleted_at") and event.get("waitlist_count", 0) > 0 \
+                and await promote_waitlist(row["event_id"]):
+            event = await db.events.find_one({"id": row["event_id"]}, {"_id": 0})
+        return event
+    if row["status"] == "waitlisted":
+        return await bump_event_counts(row["event_id"], waitlisted=-1)
+    return None
+
+@api_router.get("/events/{event_id}/rsvp")
+async def get_rsvp(request: Request, event_id: str):
+    """Current member's RSVP status and the event's headcounts"""
+    user = await require_auth(request)
+    row = await db.event_attendance.find_one({"event_id": event_id, "user_id": user.user_id})
+    return await rsvp_response(event_id, row)
+
+@api_router.post("/events/{event_id}/rsvp")
+async def join_event(request: Request, event_id: str, rsvp: Optional[RsvpRequest] = None):
+    """Sign up for an event; when it's full, join the waitlist (unless waitlist=false)"""
+    user = await require_auth(request)
+    rsvp = rsvp or RsvpRequest()
+    event = await db.events.find_one({"id": event_id, **NOT_DELETED}, {"_id": 0, "start_time": 1})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event hittades inte")
+    now = datetime.now(timezone.utc)
+    if as_utc(event["start_time"]) <= now:
+        raise HTTPException(status_code=400, detail="Eventet har redan börjat")
+
+    # The unique (event_id, user_id) row makes repeated or concurrent joins by
+    # the same member count once
+    key = {"event_id": event_id, "user_id": user.user_id}
+    row = {**key, "status": "joining", "joined_at": now}
+    try:
+        await db.event_attendance.insert_one(row)
+    except DuplicateKeyError:
+        row = await db.event_attendance.find_one(key)
+        return await rsvp_response(event_id, row)
+
+    # One conditional update claims a seat, so a burst of joins can't overbook.
+    # Seats that free up while people are queued go to the queue, not to
+    # whoever joins next.
+    # The member may cancel (or be deleted) while the row is still joining;
+    # the leave then has nothing to give back, so the join undoes its own count
+    joining = {"_id": row["_id"], "status": "joining"}
+    updated = await bump_event_counts(event_id, going=1, extra_filter=has_open_seat())
+    if updated is not None:
+        result = await db.event_attendance.update_one(joining, {"$set": {"status": "going"}})
+        if not result.matched_count:
+            return await rsvp_response(event_id, None, await remove_attendance({**key, "status": "going"}))
+        logger.info(f"{user.email} joined event {event_id}")
+        return await rsvp_response(event_id, {**key, "status": "going"}, updated)
+
+    if not rsvp.waitlist:
+        await db.event_attendance.delete_one(joining)
+        raise HTTPException(status_code=409, detail="Eventet är fullt")
+    await bump_event_counts(event_id, waitlisted=1)
+    row.update(status="waitlisted", waitlisted_at=datetime.now(timezone.utc))
+    result = await db.event_attendance.update_one(
+        joining, {"$set": {"status": "waitlisted", "waitlisted_at": row["waitlisted_at"]}}
+    )
+    if not result.matched_count:
+        return await rsvp_response(event_id, None, await remove_attendance({**key, "status": "waitlisted"}))
+    # A seat may have freed up (or the queue emptied) in between
+    if user.user_id in await promote_waitlist(event_id):
+        row["status"] = "going"
+    else:
+        logger.info(f"{user.email} joined the waitlist of event {event_id}")
+    return await rsvp_response(event_id, row)
+
+@api_router.delete("/events/{event_id}/rsvp")
+async def leave_event(request: Request, event_id: str):
+    """Cancel the current member's seat or waitlist spot"""
+    user = await require_auth(request)
+    row = await db.event_attendance.find_one_and_delete(
+        {"event_id": event_id, "user_id": user.user_id}, projection={"_id": 0}
+    )
+    if not row:
+        raise HTTPException(status_code=404, detail="Du är inte anmäld till eventet")
+    updated = await remove_attendance(row)
+    logger.info(f"{user.email} left event {event_id}")
+    return await rsvp_response(event_id, None, updated)
+
+@api_router.get("/events/{event_id}/attendees")
+async def get_attendees(request: Request, event_id: str):
+    """Attendees and waitlist in order (admin only)"""
+    await require_admin(request)
+    event = await db.events.find_one(
+        {"id": event_id}, {"_id": 0, "capacity": 1, "attendee_count": 1, "waitlist_count": 1}
+    )
+    if not event:
+        raise HTTPException(status_code=404, detail="Event hittades inte")
+    going, waitlist = await asyncio.gather(
+        db.event_attendance.find({"event_id": event_id, "status": "going"}, {"_id": 0}).sort("joined_at", 1).to_list(None),
+        db.event_attendance.find({"event_id": event_id, "status": "waitlisted"}, {"_id": 0}).sort(WAITLIST_ORDER).to_list(None),
+    )
+    users = {u["user_id"]: u async for u in db.users.find(
+        {"user_id": {"$in": [r["user_id"] for r in going + waitlist]}}, {"_id": 0, "user_id": 1, "name": 1, "email": 1}
+    )}
+
+    def entry(row):
+        user = users.get(row["user_id"], {})
+        return {"user_id": row["user_id"], "name": user.get("name"), "email": user.get("email"), "joined_at": row["joined_at"]}
+
+    return {
+        "event_id": event_id,
+        "capacity": event.get("capacity"),
+        "attendee_count": event.get("attendee_count", 0),
+        "waitlist_count": event.get("waitlist_count", 0),
+        "attendees": [entry(r) for r in going],
+        "waitlist": [entry(r) for r in waitlist],
+    }
 
 # ==================== NEWS ENDPOINTS ====================
 
 @api_router.get("/news")
-async def get_news():
+async def get_news(request: Request):
     """Get all news"""
-    news = await db.news.find({}, {"_id": 0}).sort("publish_date", -1).to_list(100)
-    return news
+    return await cached_list_response(
+        request, ("news",), "news",
+        lambda: public_reads().news.find(NOT_DELETED, {"_id": 0}).sort("publish_date", -1).to_list(100),
+    )
 
 @api_router.get("/news/{news_id}")
-async def get_news_item(news_id: str):
+async def get_news_item(request: Request, news_id: str):
     """Get single news item"""
-    news = await db.news.find_one({"id": news_id}, {"_id": 0})
+    news = await db.news.find_one({"id": news_id, **NOT_DELETED}, {"_id": 0})
     if not news:
         raise HTTPException(status_code=404, detail="Nyhet hittades inte")
-    return news
+    return versioned_response(request, news)
 
 @api_router.post("/news")
 async def create_news(request: Request, news: NewsCreate):
@@ -768,71 +2715,796 @@ async def create_news(request: Request, news: NewsCreate):
         **news.model_dump(),
         created_by=user.user_id
     )
+    doc = news_doc.model_dump()
     
-    await db.news.insert_one(news_doc.model_dump())
+    await db.news.insert_one(dict(doc))
+    await record_change("news", "create", doc["id"], doc)
+    audit_log.record(request, user, "news.create", "news", doc["id"], title=doc["title"])
     
     # Send push notifications
     await send_news_notifications(news_doc)
     
-    return news_doc.model_dump()
+    return json_bytes_response(encode_json(doc))
 
 @api_router.put("/news/{news_id}")
 async def update_news(request: Request, news_id: str, update: NewsUpdate):
-    """Update news (admin only)"""
-    await require_admin(request)
-    
-    existing = await db.news.find_one({"id": news_id})
-    if not existing:
-        raise HTTPException(status_code=404, detail="Nyhet hittades inte")
+    """Update news (admin only); If-Match works as for events"""
+    user = await require_admin(request)
     
     update_data = {k: v for k, v in update.model_dump().items() if v is not None}
     
-    await db.news.update_one(
-        {"id": news_id},
-        {"$set": update_data}
-    )
-    
-    updated = await db.news.find_one({"id": news_id}, {"_id": 0})
-    return updated
+    try:
+        existing, updated = await versioned_update("news", news_id, update_data, if_match_version(request))
+    except VersionConflict as conflict:
+        return conflict.response("Nyheten har ändrats av någon annan")
+    if existing is None:
+        raise HTTPException(status_code=404, detail="Nyhet hittades inte")
+    await record_change("news", "update", news_id, updated)
+    audit_log.record(request, user, "news.update", "news", news_id, audit_changes(existing, update_data))
+    return versioned_response(request, updated)
 
 @api_router.delete("/news/{news_id}")
 async def delete_news(request: Request, news_id: str):
-    """Delete news (admin only)"""
-    await require_admin(request)
+    """Move a news item to the trash (admin only); undo with POST /news/{id}/restore"""
+    user = await require_admin(request)
     
-    result = await db.news.delete_one({"id": news_id})
-    if result.deleted_count == 0:
+    news = await move_to_trash(request, "news", news_id, user)
+    if news is None:
         raise HTTPException(status_code=404, detail="Nyhet hittades inte")
     
-    return {"message": "Nyhet borttagen"}
+    return {"message": "Nyhet borttagen", "id": news_id, "deleted_at": news["deleted_at"]}
+
+@api_router.post("/news/{news_id}/restore")
+async def restore_news(request: Request, news_id: str):
+    """Take a news item back out of the trash (admin only)"""
+    user = await require_admin(request)
+    news = await restore_from_trash("news", news_id)
+    if news is None:
+        raise HTTPException(status_code=404, detail="Nyheten finns inte i papperskorgen")
+    audit_log.record(request, user, "news.restore", "news", news_id, title=news["title"])
+    return json_bytes_response(encode_json(news))
+
+# ==================== TRASH ====================
+
+# Tombstones stay restorable for TOMBSTONE_RETENTION_DAYS, then the TTL
+# indexes on deleted_at (and on event_attendance.event_deleted_at, so a
+# purged event's sign-ups go with it) remove them.
+TOMBSTONE_RETENTION_DAYS = int(os.environ.get("TOMBSTONE_RETENTION_DAYS", "30"))
+TRASH_LIST_LIMIT = 100
+
+def trash_update(user: "Principal", now: datetime) -> dict:
+    """The write that tombstones a live event or news item"""
+    return {"$set": {"deleted_at": now, "deleted_by": user.user_id}, "$inc": {"version": 1}}
+
+async def finish_trashing(request: Request, user: "Principal", collection: str, docs: List[dict],
+                          now: datetime, **details) -> None:
+    """Everything after the tombstone write, for one delete or a batch of them"""
+    if not docs:
+        return
+    if collection == "events":
+        # Attendance rows expire along with the tombstone
+        await db.event_attendance.update_many(
+            {"event_id": {"$in": [doc["id"] for doc in docs]}}, {"$set": {"event_deleted_at": now}}
+        )
+    await record_changes([(collection, "delete", doc["id"], None) for doc in docs])
+    target_type = "event" if collection == "events" else "news"
+    for doc in docs:
+        audit_log.record(request, user, f"{target_type}.delete", target_type, doc["id"], title=doc.get("title"), **details)
+
+async def move_to_trash(request: Request, collection: str, doc_id: str, user: "Principal") -> Optional[dict]:
+    """Tombstone a live event or news item; returns its id, title and deleted_at"""
+    now = datetime.now(timezone.utc)
+    doc = await db[collection].find_one_and_update(
+        {"id": doc_id, **NOT_DELETED},
+        trash_update(user, now),
+        projection={"_id": 0, "id": 1, "title": 1, "deleted_at": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    if doc is None:
+        return None
+    await finish_trashing(request, user, collection, [doc], now)
+    return doc
+
+async def restore_from_trash(collection: str, doc_id: str) -> Optional[dict]:
+    doc = await db[collection].find_one_and_update(
+        {"id": doc_id, "deleted_at": {"$ne": None}},
+        {"$set": {"deleted_at": None}, "$unset": {"deleted_by": ""}, "$inc": {"version": 1}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER,
+    )
+    if doc is None:
+        return None
+    if collection == "events":
+        await db.event_attendance.update_many({"event_id": doc_id}, {"$unset": {"event_deleted_at": ""}})
+    # Clients dropped it on the delete, so it comes back as a create
+    await record_change(collection, "create", doc_id, doc)
+    return doc
+
+@api_router.get("/admin/trash/{collection}")
+async def get_trash(request: Request, collection: str):
+    """Deleted events or news that can still be restored, newest first (admin only)"""
+    await require_admin(request)
+    if collection not in ("events", "news"):
+        raise HTTPException(status_code=404, detail="Okänd samling")
+    docs = await db[collection].find(
+        {"deleted_at": {"$type": "date"}},
+        {"_id": 0, "id": 1, "title": 1, "deleted_at": 1, "deleted_by": 1},
+    ).sort("deleted_at", -1).limit(TRASH_LIST_LIMIT).to_list(None)
+    purge_after = timedelta(days=TOMBSTONE_RETENTION_DAYS)
+    for doc in docs:
+        doc["purge_at"] = as_utc(doc["deleted_at"]) + purge_after
+    return docs
+
+# ==================== OPTIMISTIC VERSIONING ====================
+
+# Every write to an event or news item bumps its version, which doubles as
+# the ETag. Admin updates also stamp field_versions.<field> with the version
+# that last set the field, so an edit based on an older version only
+# conflicts where someone else changed the same field in the meantime;
+# edits to different fields are merged.
+VERSION_WRITE_RETRIES = 3
+
+class VersionConflict(Exception):
+    def __init__(self, current: dict, fields: List[str]):
+        self.current = current
+        self.fields = fields
+
+    def response(self, message: str) -> Response:
+        """409 with the conflicting fields and the current document to merge against"""
+        body = encode_json({"detail": message, "conflicts": self.fields, "current": self.current})
+        return json_bytes_response(body, status_code=409, headers={"ETag": version_etag(self.current)})
+
+def version_etag(doc: dict) -> str:
+    # Weak: the compression middleware may re-encode the body
+    return f'W/"{doc.get("version", 1)}"'
+
+def parse_etag_version(tag: str) -> Optional[int]:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+    return int(tag) if tag.isdigit() else None
+
+def if_match_version(request: Request) -> Optional[int]:
+    """Version an edit is based on, from If-Match; None when absent or *"""
+    value = request.headers.get("if-match")
+    if not value or value.strip() == "*":
+        return None
+    version = parse_etag_version(value)
+    if version is None:
+        raise HTTPException(status_code=400, detail="Ogiltig If-Match-header")
+    return version
+
+def versioned_response(request: Request, doc: dict) -> Response:
+    """The document with its version ETag, or 304 if If-None-Match has it"""
+    etag = version_etag(doc)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and doc.get("version", 1) in {parse_etag_version(t) for t in if_none_match.split(",")}:
+        return Response(status_code=304, headers={"ETag": etag})
+    return json_bytes_response(encode_json(doc), headers={"ETag": etag})
+
+def merge_conflicts(current: dict, update_data: dict, base_version: int) -> List[str]:
+    """Fields in update_data that were changed after base_version to something else"""
+    field_versions = current.get("field_versions") or {}
+    return [
+        field for field, value in update_data.items()
+        if field != "updated_at"
+        and field_versions.get(field, 0) > base_version
+        and not same_stored_value(current.get(field), value)
+    ]
+
+def written_fields(update_data: dict) -> List[str]:
+    return [field for field in update_data if field != "updated_at"]
+
+def versioned_write(update_data: dict) -> list:
+    """Update pipeline that sets update_data, bumps the version and stamps
+    the written fields with the new version, all in one atomic write"""
+    return [
+        {"$set": {"version": {"$add": [{"$ifNull": ["$version", 1]}, 1]}}},
+        {"$set": {
+            **{field: {"$literal": value} for field, value in update_data.items()},
+            **{f"field_versions.{field}": "$version" for field in written_fields(update_data)},
+        }},
+    ]
+
+def field_version_pins(current: dict, update_data: dict) -> dict:
+    """Filter matching only while nobody has rewritten the fields about to be written"""
+    stamps = current.get("field_versions") or {}
+    return {f"field_versions.{field}": stamps.get(field) for field in written_fields(update_data)}
+
+async def versioned_update(collection: str, doc_id: str, update_data: dict,
+                           base_version: Optional[int]) -> tuple:
+    """Update a live event or news item, bumping its version.
+
+    Returns (before, after), or (None, None) if there is no such document.
+    Without a base version the fields sent simply win. With one, the write
+    is pinned to the stamps of the fields it checked, so only edits to the
+    same fields can interfere (RSVPs and other fields can't), and
+    VersionConflict is raised when one of them changed after the base.
+    """
+    pins: dict = {}
+    for _ in range(VERSION_WRITE_RETRIES):
+        current = await db[collection].find_one({"id": doc_id, **NOT_DELETED}, {"_id": 0})
+        if current is None:
+            return None, None
+        if base_version is not None:
+            conflicts = merge_conflicts(current, update_data, base_version)
+            if conflicts:
+                raise VersionConflict(current, conflicts)
+            pins = field_version_pins(current, update_data)
+        updated = await db[collection].find_one_and_update(
+            {"id": doc_id, **NOT_DELETED, **pins},
+            versioned_write(update_data),
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER,
+        )
+        if updated is not None:
+            return current, updated
+    # The same fields kept being rewritten under us; let the client retry
+    latest = await db[collection].find_one({"id": doc_id}, {"_id": 0}) or current
+    moved = field_version_pins(latest, update_data)
+    raise VersionConflict(latest, [key.split(".", 1)[1] for key, stamp in moved.items() if pins.get(key) != stamp])
+
+# ==================== HOME SNAPSHOT ====================
+
+HOME_EVENTS_PER_CATEGORY = int(os.environ.get("HOME_EVENTS_PER_CATEGORY", "3"))
+HOME_NEWS_COUNT = 5
+HOME_SUMMARY_LENGTH = 140
+HOME_EVENT_FIELDS = {"_id": 0, "id": 1, "title": 1, "category": 1, "start_time": 1, "end_time": 1, "location": 1}
+HOME_NEWS_FIELDS = {"_id": 0, "id": 1, "title": 1, "body": 1, "image": 1, "publish_date": 1}
+
+def as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+def news_summary(doc: dict) -> dict:
+    body = doc.get("body") or ""
+    return {
+        "id": doc["id"],
+        "title": doc["title"],
+        "summary": body if len(body) <= HOME_SUMMARY_LENGTH else body[:HOME_SUMMARY_LENGTH].rstrip() + "…",
+        "has_image": bool(doc.get("image")),
+        "publish_date": doc["publish_date"],
+    }
+
+class HomeSnapshot:
+    """The precomposed /api/home payload, kept per section.
+
+    Categories, news and each category's upcoming events are only re-read
+    when their data version moves, or, for events, when the first listed
+    event of a category has started. Requests in between get the same
+    encoded bytes.
+    """
+
+    def __init__(self):
+        self.versions: Dict[str, int] = {}
+        self.categories: List[dict] = []
+        self.upcoming: Dict[str, List[dict]] = {}
+        self.news: List[dict] = []
+        self.expires_at: Optional[datetime] = None
+        self.body: Optional[CachedBody] = None
+        self.lock = asyncio.Lock()
+
+    def payload(self) -> dict:
+        firsts = [events[0] for events in self.upcoming.values() if events]
+        return {
+            "next_event": min(firsts, key=lambda e: as_utc(e["start_time"])) if firsts else None,
+            "upcoming": self.upcoming,
+            "news": self.news,
+            "categories": self.categories,
+        }
+
+    async def refresh(self) -> CachedBody:
+        async with self.lock:
+            now = datetime.now(timezone.utc)
+            if self.expires_at is not None and now >= self.expires_at:
+                self.versions = {}  # read from a possibly lagging secondary
+            reads = public_reads()
+            changed = self.body is None
+
+            version = data_versions["categories"]
+            if self.versions.get("categories") != version:
+                self.categories = await reads.categories.find({}, {"_id": 0}).to_list(20)
+                self.versions["categories"] = version
+                self.upcoming = {}
+                changed = True
+
+            version = data_versions["events"]
+            if self.versions.get("events") != version:
+                stale = [c["slug"] for c in self.categories]
+                self.versions["events"] = version
+            else:
+                stale = [c["slug"] for c in self.categories if c["slug"] not in self.upcoming]
+                stale += [slug for slug, events in self.upcoming.items()
+                          if events and as_utc(events[0]["start_time"]) < now]
+            if stale:
+                results = await asyncio.gather(*[
+                    reads.events.find({**NOT_DELETED, "category": slug, "start_time": {"$gte": now}}, HOME_EVENT_FIELDS)
+                    .sort("start_time", 1).to_list(HOME_EVENTS_PER_CATEGORY)
+                    for slug in stale
+                ])
+                self.upcoming.update(zip(stale, results))
+                changed = True
+
+            version = data_versions["news"]
+            if self.versions.get("news") != version:
+                docs = await reads.news.find(NOT_DELETED, HOME_NEWS_FIELDS).sort("publish_date", -1).to_list(HOME_NEWS_COUNT)
+                self.news = [news_summary(doc) for doc in docs]
+                self.versions["news"] = version
+                changed = True
+
+            if changed:
+                self.body = CachedBody(encode_json(self.payload()))
+                self.expires_at = public_read_expiry()
+            return self.body
+
+home_snapshot = HomeSnapshot()
+
+@api_router.get("/home")
+async def get_home(request: Request):
+    """Next events per category, latest news summaries and categories in one cached payload"""
+    return cached_body_response(request, await home_snapshot.refresh(), "application/json")
+
+# ==================== ADMIN BATCH WRITES ====================
+
+BATCH_MAX_OPERATIONS = 500
+
+class BatchOperation(BaseModel):
+    collection: str  # events | news
+    op: str  # create | update | delete
+    id: Optional[str] = None
+    data: Dict[str, Any] = Field(default_factory=dict)
+    version: Optional[int] = None  # update only: like If-Match on PUT
+
+async def find_by_ids(collection: str, ids: List[str], extra_filter: Optional[dict] = None) -> List[dict]:
+    """Documents with the given ids, without a round trip when there are none"""
+    if not ids:
+        return []
+    return await db[collection].find({"id": {"$in": ids}, **(extra_filter or {})}, {"_id": 0}).to_list(None)
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation]
+
+BATCH_MODELS = {
+    ("events", "create"): EventCreate,
+    ("events", "update"): EventUpdate,
+    ("news", "create"): NewsCreate,
+    ("news", "update"): NewsUpdate,
+}
+
+@api_router.post("/admin/batch")
+async def admin_batch(request: Request, batch: BatchRequest):
+    """Apply many event/news creates, updates and deletes in one request (admin only).
+
+    Each collection gets a single unordered bulk_write. Operations fail
+    individually and are reported per index; notifications for everything
+    that succeeded go out in one coalesced pass at the end.
+    """
+    user = await require_admin(request)
+    operations = batch.operations
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"Högst {BATCH_MAX_OPERATIONS} operationer per anrop")
+
+    results = [
+        {"index": i, "collection": op.collection, "op": op.op, "id": op.id, "status": "ok"}
+        for i, op in enumerate(operations)
+    ]
+
+    target_ids = {"events": [], "news": []}
+    id_counts: Dict[tuple, int] = {}
+    for op in operations:
+        if op.collection in target_ids and op.op in ("update", "delete") and op.id:
+            target_ids[op.collection].append(op.id)
+            id_counts[(op.collection, op.id)] = id_counts.get((op.collection, op.id), 0) + 1
+    found = await asyncio.gather(*[
+        find_by_ids(name, ids, NOT_DELETED) for name, ids in target_ids.items()
+    ])
+    # Full documents: updates are audited as field diffs against them
+    existing = {name: {d["id"]: d for d in docs} for name, docs in zip(target_ids, found)}
+
+    writes: Dict[str, list] = {"events": [], "news": []}
+    positions: Dict[str, List[int]] = {"events": [], "news": []}
+    batch_time = datetime.now(timezone.utc)
+    created: Dict[int, BaseModel] = {}
+    updated_fields: Dict[int, dict] = {}
+
+    for i, op in enumerate(operations):
+        result = results[i]
+        if op.collection not in writes or op.op not in ("create", "update", "delete"):
+            result.update(status="invalid", detail="Okänd samling eller operation")
+            continue
+        if op.op != "create":
+            if op.id not in existing[op.collection]:
+                result.update(status="not_found", detail="Hittades inte")
+                continue
+            if id_counts[(op.collection, op.id)] > 1:
+                # Unordered bulk writes give no ordering guarantee within a batch
+                result.update(status="invalid", detail="Flera operationer på samma id")
+                continue
+        try:
+            if op.op == "create":
+                model = BATCH_MODELS[(op.collection, "create")](**op.data)
+                doc_model = Event if op.collection == "events" else News
+                doc = doc_model(**model.model_dump(), created_by=user.user_id)
+                writes[op.collection].append(InsertOne(doc.model_dump()))
+                created[i] = doc
+                result["id"] = doc.id
+            elif op.op == "update":
+                model = BATCH_MODELS[(op.collection, "update")](**op.data)
+                if isinstance(model, EventUpdate):
+                    update_data = model.update_fields()
+                else:
+                    update_data = {k: v for k, v in model.model_dump().items() if v is not None}
+                if not update_data:
+                    result.update(status="invalid", detail="Inget att uppdatera")
+                    continue
+                if op.collection == "events":
+                    update_data["updated_at"] = datetime.now(timezone.utc)
+                current = existing[op.collection][op.id]
+                conflicts = merge_conflicts(current, update_data, op.version) if op.version is not None else []
+                if conflicts:
+                    result.update(status="conflict", detail="Ändrat av någon annan: " + ", ".join(conflicts),
+                                  version=current.get("version", 1))
+                    continue
+                pins = field_version_pins(current, update_data) if op.version is not None else {}
+                writes[op.collection].append(UpdateOne(
+                    {"id": op.id, **NOT_DELETED, **pins}, versioned_write(update_data),
+                ))
+                updated_fields[i] = update_data
+            else:
+                writes[op.collection].append(UpdateOne(
+                    {"id": op.id, **NOT_DELETED},
+                    trash_update(user, batch_time),
+                ))
+        except ValidationError as e:
+            result.update(status="invalid", detail=e.errors()[0]["msg"])
+            continue
+        positions[op.collection].append(i)
+
+    async def run_writes(name: str):
+        if not writes[name]:
+            return
+        try:
+            await db[name].bulk_write(writes[name], ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                results[positions[name][error["index"]]].update(status="error", detail=error.get("errmsg", ""))
+
+    await asyncio.gather(*[run_writes(name) for name in writes])
+
+    succeeded = [i for name in positions for i in positions[name] if results[i]["status"] == "ok"]
+    updated_ids = {name: [operations[i].id for i in succeeded if i in updated_fields and operations[i].collection == name]
+                   for name in writes}
+    fetched = await asyncio.gather(*[
+        find_by_ids(name, ids) for name, ids in updated_ids.items()
+    ])
+    updated_docs = {(name, d["id"]): d for name, docs in zip(updated_ids, fetched) for d in docs}
+    # A versioned update whose field pins no longer matched left the
+    # document as the concurrent writer had it; report that instead of
+    # claiming success (unversioned ones only miss a concurrent delete)
+    for i in [i for i in succeeded if i in updated_fields]:
+        op = operations[i]
+        doc = updated_docs.get((op.collection, op.id))
+        if doc is None or op.version is not None and not all(
+                same_stored_value(doc.get(f), v) for f, v in updated_fields[i].items()):
+            results[i].update(status="conflict", detail="Ändrat av någon annan, försök igen",
+                              version=(doc or {}).get("version"))
+    succeeded = [i for i in succeeded if results[i]["status"] == "ok"]
+
+    changes = []
+    for i in sorted(succeeded):
+        op = operations[i]
+        target_type = "event" if op.collection == "events" else "news"
+        if op.op == "create":
+            changes.append((op.collection, "create", created[i].id, created[i].model_dump()))
+            audit_log.record(request, user, f"{target_type}.create", target_type, created[i].id, title=created[i].title, batch=True)
+        elif op.op == "update":
+            changes.append((op.collection, "update", op.id, updated_docs.get((op.collection, op.id))))
+            audit_log.record(request, user, f"{target_type}.update", target_type, op.id,
+                             audit_changes(existing[op.collection][op.id], updated_fields[i]), batch=True)
+    await record_changes(changes)
+    for name in writes:
+        await finish_trashing(request, user, name, [
+            existing[name][operations[i].id] for i in sorted(succeeded)
+            if operations[i].collection == name and operations[i].op == "delete"
+        ], batch_time, batch=True)
+    for i in succeeded:
+        if operations[i].collection == "events" and "capacity" in updated_fields.get(i, {}):
+            await promote_waitlist(operations[i].id)
+
+    await send_batch_notifications(
+        new_events=[created[i] for i in succeeded if i in created and operations[i].collection == "events"],
+        updated_events=[
+            Event(**updated_docs[("events", operations[i].id)]) for i in succeeded
+            if operations[i].collection == "events" and i in updated_fields
+            and ("start_time" in updated_fields[i] or "location" in updated_fields[i])
+            and ("events", operations[i].id) in updated_docs
+        ],
+        new_news=[created[i] for i in succeeded if i in created and operations[i].collection == "news"],
+    )
+
+    logger.info(f"Admin {user.email} ran batch of {len(operations)} operations, {len(succeeded)} succeeded")
+    return {"succeeded": len(succeeded), "failed": len(operations) - len(succeeded), "results": results}
 
 # ==================== CATEGORIES ENDPOINTS ====================
 
 @api_router.get("/categories")
-async def get_categories():
+async def get_categories(request: Request):
     """Get all event categories"""
-    categories = await db.categories.find({}, {"_id": 0}).to_list(20)
-    return categories
+    return await cached_list_response(
+        request, ("categories",), "categories",
+        lambda: public_reads().categories.find({}, {"_id": 0}).to_list(20),
+    )
+
+# ==================== SEARCH ====================
+
+SEARCH_MAX_RESULTS = 500
+SNIPPET_LENGTH = 160
+
+# (collection, result type, text fields with weights, extra fields returned)
+SEARCH_SOURCES = [
+    ("events", "event", {"title": 10, "description": 2}, ["start_time", "category"]),
+    ("news", "news", {"title": 10, "body": 2}, ["publish_date"]),
+]
+
+# Longest first so e.g. "arna" wins over "a"
+SWEDISH_SUFFIXES = sorted([
+    "heterna", "hetens", "anden", "heten", "heter", "arnas", "ernas", "ornas",
+    "andes", "arens", "arna", "erna", "orna", "ande", "arne", "aste", "aren",
+    "ades", "enes", "ern", "at", "ad", "are", "ast", "ens", "het", "ar", "er",
+    "or", "en", "et", "a", "e", "s",
+], key=len, reverse=True)
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Probed on search until known. Databases without $text support (the
+# mongomock stand-in used in tests) get the in-memory index below instead,
+# as do searches that arrive before the text indexes are built.
+text_search_supported: Optional[bool] = None
+
+def swedish_stem(word: str) -> str:
+    """Light suffix-stripping stemmer, close enough to Mongo's for matching"""
+    word = word.casefold()
+    for suffix in SWEDISH_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+def search_terms(text: str) -> List[str]:
+    return [swedish_stem(w) for w in WORD_RE.findall(text)]
+
+def make_snippet(text: str, stems: set) -> dict:
+    """Cut a window around the first matching word and mark every match in it"""
+    matches = [m for m in WORD_RE.finditer(text) if swedish_stem(m.group()) in stems]
+    start = 0
+    if matches and len(text) > SNIPPET_LENGTH:
+        start = max(0, matches[0].start() - SNIPPET_LENGTH // 4)
+    end = min(len(text), start + SNIPPET_LENGTH)
+
+    snippet = text[start:end]
+    highlights = [[m.start() - start, m.end() - start] for m in matches if m.end() <= end]
+    if start > 0:
+        snippet = "…" + snippet
+        highlights = [[a + 1, b + 1] for a, b in highlights]
+    if end < len(text):
+        snippet += "…"
+    return {"snippet": snippet, "highlights": highlights}
+
+def search_hit(result_type: str, doc: dict, extra_fields: List[str], body_field: str, stems: set, score: float) -> dict:
+    hit = {
+        "type": result_type,
+        "id": doc["id"],
+        "title": doc["title"],
+        "score": round(score, 4),
+        **make_snippet(doc.get(body_field) or doc["title"], stems),
+    }
+    for field in extra_fields:
+        hit[field] = doc.get(field)
+    return hit
+
+class InvertedIndex:
+    """In-memory fallback for databases without $text support.
+
+    Maps stem -> {(source index, doc id): weighted term frequency} and is
+    rebuilt whenever the events or news data version moves.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.postings: Dict[str, Dict[tuple, float]] = {}
+        self.docs: Dict[tuple, dict] = {}
+
+    async def refresh(self):
+        version = (data_versions["events"], data_versions["news"])
+        if version == self.version:
+            return
+        postings: Dict[str, Dict[tuple, float]] = {}
+        docs: Dict[tuple, dict] = {}
+        for source, (collection, _, weights, extra_fields) in enumerate(SEARCH_SOURCES):
+            projection = {"_id": 0, "id": 1, **{f: 1 for f in weights}, **{f: 1 for f in extra_fields}}
+            async for doc in db[collection].find(NOT_DELETED, projection):
+                key = (source, doc["id"])
+                docs[key] = doc
+                for field, weight in weights.items():
+                    for stem in search_terms(doc.get(field) or ""):
+                        bucket = postings.setdefault(stem, {})
+                        bucket[key] = bucket.get(key, 0) + weight
+        self.postings, self.docs, self.version = postings, docs, version
+
+    def query(self, stems: set, limit: int) -> List[tuple]:
+        scores: Dict[tuple, float] = {}
+        for stem in stems:
+            for key, weight in self.postings.get(stem, {}).items():
+                scores[key] = scores.get(key, 0) + weight
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+        return [(key[0], self.docs[key], score) for key, score in ranked]
+
+fallback_search_index = InvertedIndex()
+
+async def probe_text_search() -> Optional[bool]:
+    """True/False once known; None while the text indexes may still be building"""
+    try:
+        await db.events.find_one({"$text": {"$search": "borka"}}, {"_id": 1})
+        return True
+    except NotImplementedError as e:
+        logger.warning(f"Text search unavailable, using in-memory index: {e}")
+        return False
+    except OperationFailure as e:
+        # The leader builds indexes in the background; ask again next search
+        logger.info(f"Text index not ready, using in-memory index for now: {e}")
+        return None
+
+async def fallback_search(q: str, limit: int) -> List[tuple]:
+    await fallback_search_index.refresh()
+    return fallback_search_index.query(set(search_terms(q)), limit)
+
+async def text_search(q: str, limit: int) -> List[tuple]:
+    """Top `limit` (source index, doc, score) hits across events and news"""
+    global text_search_supported
+    if text_search_supported is None:
+        text_search_supported = await probe_text_search()
+
+    if not text_search_supported:
+        return await fallback_search(q, limit)
+
+    try:
+        per_source = await asyncio.gather(*[
+            db[collection].find(
+                {"$text": {"$search": q, "$language": "swedish"}, **NOT_DELETED},
+                {"_id": 0, "id": 1, **{f: 1 for f in weights}, **{f: 1 for f in extra_fields},
+                 "score": {"$meta": "textScore"}},
+            ).sort([("score", {"$meta": "textScore"})]).limit(limit).to_list(limit)
+            for collection, _, weights, extra_fields in SEARCH_SOURCES
+        ])
+    except OperationFailure as e:
+        # One source's text index is missing (still building, or rebuilt)
+        logger.info(f"Text search failed, using in-memory index for now: {e}")
+        text_search_supported = None
+        return await fallback_search(q, limit)
+    hits = [(source, doc, doc.pop("score")) for source, docs in enumerate(per_source) for doc in docs]
+    return sorted(hits, key=lambda hit: hit[2], reverse=True)[:limit]
+
+@api_router.get("/search")
+async def search(q: str, page: int = 1, limit: int = 20):
+    """Full-text search over events and news, ranked by relevance"""
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="Sökfrågan får inte vara tom")
+    page = max(page, 1)
+    limit = min(max(limit, 1), 50)
+
+    offset = (page - 1) * limit
+    if offset >= SEARCH_MAX_RESULTS:
+        return {"query": q, "page": page, "limit": limit, "results": [], "has_more": False}
+
+    fetch = min(offset + limit + 1, SEARCH_MAX_RESULTS)
+    hits = await text_search(q, fetch)
+    stems = set(search_terms(q))
+
+    results = []
+    for source, doc, score in hits[offset:offset + limit]:
+        _, result_type, weights, extra_fields = SEARCH_SOURCES[source]
+        body_field = [f for f in weights if f != "title"][0]
+        results.append(search_hit(result_type, doc, extra_fields, body_field, stems, score))
+
+    return {
+        "query": q,
+        "page": page,
+        "limit": limit,
+        "results": results,
+        "has_more": len(hits) > offset + limit,
+    }
 
 # ==================== CALENDAR ICS ENDPOINTS ====================
 
+ICS_CACHE_MAX_ENTRIES = 64
+_ics_cache: "OrderedDict[tuple, tuple]" = OrderedDict()  # key -> (body, valid until)
+_ics_inflight: Dict[tuple, asyncio.Future] = {}
+
+async def render_calendar_ics(categories: Optional[frozenset] = None) -> CachedBody:
+    """Render the ICS feed for a category set (None = all), cached per data version.
+
+    Subscribers with the same preferences share one render, and concurrent
+    misses for the same key wait on a single in-flight render.
+    """
+    key = (categories, data_versions["events"])
+    cached = _ics_cache.get(key)
+    if cached is not None and (cached[1] is None or datetime.now(timezone.utc) < cached[1]):
+        _ics_cache.move_to_end(key)
+        return cached[0]
+
+    inflight = _ics_inflight.get(key)
+    if inflight is not None:
+        try:
+            return await asyncio.shield(inflight)
+        except asyncio.CancelledError:
+            if not inflight.cancelled():
+                raise
+            # The shared render failed; fall through and render ourselves
+
+    future = asyncio.get_running_loop().create_future()
+    _ics_inflight[key] = future
+    try:
+        query = {"category": {"$in": sorted(categories)}} if categories is not None else {}
+        events = await public_reads().events.find({**NOT_DELETED, **query}, {"_id": 0}).sort("start_time", 1).to_list(500)
+        ics_content = CachedBody(generate_ics(events).encode("utf-8"))
+        future.set_result(ics_content)
+    finally:
+        _ics_inflight.pop(key, None)
+        if not future.done():
+            future.cancel()
+
+    # Only store if no write happened while rendering
+    if key[1] == data_versions["events"]:
+        _ics_cache[key] = (ics_content, public_read_expiry())
+        _ics_cache.move_to_end(key)
+        while len(_ics_cache) > ICS_CACHE_MAX_ENTRIES:
+            _ics_cache.popitem(last=False)
+    return ics_content
+
+def feed_categories(user_doc: dict) -> Optional[frozenset]:
+    """Event category slugs a feed subscriber has opted into (None = all)"""
+    prefs = (user_doc.get("notification_preferences") or {}).get("categories") or {}
+    selected = frozenset(slug for slug, enabled in prefs.items() if enabled and slug != "news")
+    if not selected and not user_doc.get("preferences_saved_at"):
+        # Nothing on and never saved: the account defaults, not a choice
+        return None
+    return selected
+
 @api_router.get("/calendar/ics", response_class=PlainTextResponse)
-async def get_calendar_ics():
+async def get_calendar_ics(request: Request):
     """Get ICS feed for all events"""
-    events = await db.events.find({}, {"_id": 0}).sort("start_time", 1).to_list(500)
+    ics_content = await render_calendar_ics()
     
-    ics_content = generate_ics(events)
-    
-    return PlainTextResponse(
-        content=ics_content,
-        media_type="text/calendar",
+    return cached_body_response(
+        request,
+        ics_content,
+        media_type="text/calendar; charset=utf-8",
+        headers={"Content-Disposition": "attachment; filename=borka-kalender.ics"}
+    )
+
+@api_router.get("/calendar/{feed_token}.ics", response_class=PlainTextResponse)
+async def get_personal_calendar_ics(request: Request, feed_token: str):
+    """Get a member's personal ICS feed, filtered by their category preferences"""
+    user_doc = await db.users.find_one(
+        {"calendar_feed_token": feed_token},
+        {"_id": 0, "notification_preferences.categories": 1, "preferences_saved_at": 1}
+    )
+    if not user_doc:
+        raise HTTPException(status_code=404, detail="Kalenderflödet hittades inte")
+
+    ics_content = await render_calendar_ics(feed_categories(user_doc))
+
+    return cached_body_response(
+        request,
+        ics_content,
+        media_type="text/calendar; charset=utf-8",
         headers={"Content-Disposition": "attachment; filename=borka-kalender.ics"}
     )
 
 @api_router.get("/calendar/event/{event_id}/ics", response_class=PlainTextResponse)
 async def get_event_ics(event_id: str):
     """Get ICS file for single event"""
-    event = await db.events.find_one({"id": event_id}, {"_id": 0})
+    event = await db.events.find_one({"id": event_id, **NOT_DELETED}, {"_id": 0})
     if not event:
         raise HTTPException(status_code=404, detail="Event hittades inte")
     
@@ -884,6 +3556,7 @@ def generate_ics(events: List[dict]) -> str:
 
 async def send_push_notification(push_token: str, title: str, body: str, data: dict = None):
     """Send push notification using Expo"""
+    from exponent_server_sdk import PushClient, PushMessage
     try:
         message = PushMessage(
             to=push_token,
@@ -896,6 +3569,63 @@ async def send_push_notification(push_token: str, title: str, body: str, data: d
     except Exception as e:
         logger.error(f"Failed to send push notification: {e}")
 
+# Expo accepts at most 100 messages per request
+PUSH_BATCH_SIZE = 100
+
+async def send_push_notifications(messages: List[tuple]):
+    """Send (push_token, title, body, data) messages in Expo-sized batches"""
+    from exponent_server_sdk import PushClient, PushMessage
+    client = PushClient()
+    loop = asyncio.get_running_loop()
+    for i in range(0, len(messages), PUSH_BATCH_SIZE):
+        batch = [
+            PushMessage(to=token, title=title, body=body, data=data or {}, sound="default")
+            for token, title, body, data in messages[i:i + PUSH_BATCH_SIZE]
+        ]
+        try:
+            await loop.run_in_executor(None, client.publish_multiple, batch)
+        except Exception as e:
+            logger.error(f"Failed to send {len(batch)} push notifications: {e}")
+
+# Promotions from cancellations that land close together go out as one batch
+PROMOTION_NOTIFY_DELAY = float(os.environ.get("PROMOTION_NOTIFY_DELAY_MS", "1000")) / 1000
+_pending_promotions: Dict[str, List[str]] = {}
+_promotion_flush: Optional[asyncio.Task] = None
+
+def queue_promotion_notices(event_id: str, user_ids: List[str]):
+    """Schedule 'you got a seat' pushes for members promoted off a waitlist"""
+    global _promotion_flush
+    _pending_promotions.setdefault(event_id, []).extend(user_ids)
+    if _promotion_flush is None or _promotion_flush.done():
+        _promotion_flush = run_in_background(flush_promotion_notices())
+
+async def flush_promotion_notices():
+    global _promotion_flush
+    await asyncio.sleep(PROMOTION_NOTIFY_DELAY)
+    pending = dict(_pending_promotions)
+    _pending_promotions.clear()
+    _promotion_flush = None  # promotions from here on start the next batch
+
+    events = {e["id"]: e async for e in db.events.find(
+        {"id": {"$in": list(pending)}, **NOT_DELETED}, {"_id": 0, "id": 1, "title": 1, "start_time": 1}
+    )}
+    users = {u["user_id"]: u["push_token"] async for u in db.users.find({
+        "user_id": {"$in": [uid for uids in pending.values() for uid in uids]},
+        "push_token": {"$ne": None},
+        "notification_preferences.enabled": True,
+    }, {"_id": 0, "user_id": 1, "push_token": 1})}
+
+    messages = [
+        (users[uid],
+         f"Du har fått en plats: {event['title']}",
+         f"Du är flyttad från väntelistan - vi ses {event['start_time'].strftime('%d/%m %H:%M')}!",
+         {"event_id": event_id, "type": "waitlist_promotion"})
+        for event_id, uids in pending.items() if (event := events.get(event_id))
+        for uid in uids if uid in users
+    ]
+    if messages:
+        await send_push_notifications(messages)
+
 async def send_new_event_notifications(event: Event):
     """Send notifications for new event"""
     # Find users who have enabled notifications for this category
@@ -964,28 +3694,228 @@ async def send_news_notifications(news: News):
             for token in tokens
         ])
 
+async def send_batch_notifications(new_events: List[Event], updated_events: List[Event], new_news: List[News]):
+    """One notification per subscriber for everything a batch changed.
+
+    A subscriber affected by a single item gets the usual message; anyone
+    affected by several gets one summary instead of a burst of pushes.
+    """
+    if not (new_events or updated_events or new_news):
+        return
+
+    users = await db.users.find({
+        "push_token": {"$ne": None},
+        "notification_preferences.enabled": True,
+    }, {"_id": 0, "push_token": 1, "notification_preferences.categories": 1}).to_list(1000)
+
+    category_names = {
+        "open_game_night": "Öppen spelkväll",
+        "member_night": "Medlemskväll",
+        "tournament": "Turnering",
+        "special_event": "Specialevent"
+    }
+
+    sends = []
+    for u in users:
+        categories = (u.get("notification_preferences") or {}).get("categories") or {}
+        messages = [
+            (f"Nytt event: {e.title}",
+             f"{category_names.get(e.category, e.category)} - {e.start_time.strftime('%d/%m %H:%M')}",
+             {"event_id": e.id, "type": "new_event"})
+            for e in new_events if categories.get(e.category)
+        ] + [
+            (f"Event uppdaterat: {e.title}",
+             "Tid eller plats har ändrats - kolla detaljerna!",
+             {"event_id": e.id, "type": "event_update"})
+            for e in updated_events if categories.get(e.category)
+        ] + [
+            (f"BORKA Nyhet: {n.title}",
+             n.body[:100] + "..." if len(n.body) > 100 else n.body,
+             {"news_id": n.id, "type": "news"})
+            for n in new_news if categories.get("news")
+        ]
+        if len(messages) == 1:
+            sends.append(send_push_notification(u["push_token"], *messages[0]))
+        elif messages:
+            sends.append(send_push_notification(
+                u["push_token"],
+                "BORKA har uppdaterats",
+                f"{len(messages)} nya eller ändrade event och nyheter - kolla appen!",
+                {"type": "batch"}
+            ))
+    if sends:
+        await asyncio.gather(*sends)
+
 # ==================== STARTUP ====================
 
-@app.on_event("startup")
-async def startup_event():
-    """Run on startup"""
-    await seed_database()
-    # Ensure indexes exist — idempotent, fast after first run
-    await asyncio.gather(
-        db.user_sessions.create_index("session_token", unique=True, background=True),
-        db.user_sessions.create_index("user_id", background=True),
-        db.users.create_index("email", unique=True, background=True),
-        db.users.create_index("user_id", unique=True, background=True),
-        db.events.create_index("id", unique=True, background=True),
-        db.events.create_index("start_time", background=True),
-        db.events.create_index("category", background=True),
-        db.news.create_index("id", unique=True, background=True),
+# Bump when the default categories or sample data change, or when the
+# startup-time setup (changes collection, seed) needs to run again
+SEED_VERSION = 1
+# Bump when ensure_indexes gains or changes an index
+INDEX_VERSION = 4
+
+# Read by the readiness probe
+startup_state: Dict[str, Any] = {"ready": False, "indexes": "pending"}
+_background_tasks: set = set()
+
+def run_in_background(coro) -> asyncio.Task:
+    """Start a startup side task, keeping a reference until it finishes"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+def expected_schema_state() -> dict:
+    return {
+        "seed_version": SEED_VERSION,
+        "migrations": [name for name, _ in MIGRATIONS],
+        "admin_email": os.environ.get("ADMIN_EMAIL", "admin@borka.se"),
+    }
+
+def schema_is_current(state: dict) -> bool:
+    return all(state.get(key) == value for key, value in expected_schema_state().items())
+
+async def initialize_database():
+    """Seed and migrate unless the stored schema state says it's done.
+
+    A warm boot is a single read of schema_state. Otherwise one worker
+    takes the init lease and does the work while the others wait for it.
+    """
+    init_lease = MongoLease("init", ttl_seconds=120)
+    while True:
+        state = await db.schema_state.find_one({"_id": "current"}) or {}
+        if schema_is_current(state):
+            return
+        if await init_lease.try_acquire():
+            break
+        await asyncio.sleep(0.5)
+
+    try:
+        # Re-check: the previous holder may have finished just before we got the lease
+        state = await db.schema_state.find_one({"_id": "current"}) or {}
+        if schema_is_current(state):
+            return
+        await ensure_changes_collection()
+        await run_migrations()
+        await seed_database()
+        await db.schema_state.update_one(
+            {"_id": "current"},
+            {"$set": {**expected_schema_state(), "updated_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+        logger.info(f"Database initialized to seed version {SEED_VERSION}")
+    finally:
+        await init_lease.release()
+
+async def ensure_indexes_if_stale():
+    state = await db.schema_state.find_one({"_id": "current"}, {"index_version": 1}) or {}
+    if state.get("index_version") == INDEX_VERSION:
+        startup_state["indexes"] = "ready"
+        return
+    await ensure_indexes()
+
+# Run by the leader (see start_leader_tasks)
+LEADER_JOBS = [ensure_indexes_if_stale, sync_admin_password]
+
+async def ensure_indexes():
+    """Create all indexes concurrently; idempotent, runs off the readiness path"""
+    startup_state["indexes"] = "building"
+    try:
+        await asyncio.gather(
+            db.user_sessions.create_index("session_token", unique=True, background=True),
+            db.user_sessions.create_index("user_id", background=True),
+            db.user_sessions.create_index("expires_at", expireAfterSeconds=0, background=True),
+            db.token_revocations.create_index("expires_at", expireAfterSeconds=0, background=True),
+            db.token_revocations.create_index("revoked_at", background=True),
+            db.rate_limits.create_index("expires_at", expireAfterSeconds=0, background=True),
+            db.users.create_index("email", unique=True, background=True),
+            db.users.create_index("user_id", unique=True, background=True),
+            db.users.create_index("calendar_feed_token", unique=True, sparse=True, background=True),
+            db.events.create_index("id", unique=True, background=True),
+            # Partial on live documents, see NOT_DELETED
+            db.events.create_index("start_time", name="start_time_live", partialFilterExpression=NOT_DELETED, background=True),
+            db.events.create_index([("category", 1), ("start_time", 1)], name="category_start_time_live",
+                                   partialFilterExpression=NOT_DELETED, background=True),
+            db.news.create_index("id", unique=True, background=True),
+            db.news.create_index([("publish_date", -1)], name="publish_date_live", partialFilterExpression=NOT_DELETED, background=True),
+            *[
+                db[name].create_index("deleted_at", name="deleted_at_ttl", expireAfterSeconds=TOMBSTONE_RETENTION_DAYS * 86400,
+                                      partialFilterExpression={"deleted_at": {"$type": "date"}}, background=True)
+                for name in ("events", "news")
+            ],
+            db.event_attendance.create_index("event_deleted_at", expireAfterSeconds=TOMBSTONE_RETENTION_DAYS * 86400,
+                                             sparse=True, background=True),
+            db.changes.create_index("seq", unique=True, background=True),
+            db.event_attendance.create_index([("event_id", 1), ("user_id", 1)], unique=True, background=True),
+            db.event_attendance.create_index("user_id", background=True),
+            db.event_attendance.create_index([("event_id", 1), ("status", 1), ("waitlisted_at", 1)], background=True),
+            db.audit_log.create_index("at", expireAfterSeconds=AUDIT_RETENTION_DAYS * 86400, background=True),
+            db.audit_log.create_index([("target_type", 1), ("target_id", 1), ("_id", -1)], background=True),
+            db.audit_log.create_index([("actor_id", 1), ("_id", -1)], background=True),
+            db.audit_log.create_index([("action", 1), ("_id", -1)], background=True),
+            db.events.create_index(
+                [("title", "text"), ("description", "text")],
+                weights={"title": 10, "description": 2},
+                default_language="swedish",
+                name="events_text",
+                background=True,
+            ),
+            db.news.create_index(
+                [("title", "text"), ("body", "text")],
+                weights={"title": 10, "body": 2},
+                default_language="swedish",
+                name="news_text",
+                background=True,
+            ),
+        )
+    except Exception as e:
+        startup_state["indexes"] = "failed"
+        logger.error(f"Index creation failed: {e}")
+        return
+    await db.schema_state.update_one(
+        {"_id": "current"}, {"$set": {"index_version": INDEX_VERSION}}, upsert=True
     )
+    startup_state["indexes"] = "ready"
     logger.info("Database indexes ensured")
 
-@app.on_event("shutdown")
+async def startup_event():
+    """Run on startup"""
+    started = time.perf_counter()
+    startup_state.update(ready=False, indexes="pending")
+    await warm_up_pool()
+    await initialize_database()
+    if MULTI_WORKER:
+        startup_state["indexes"] = "leader"
+        run_in_background(lead_forever())
+        run_in_background(follow_changes_forever())
+    else:
+        leader_lease.held = True
+        start_leader_tasks()
+    if SESSION_SIGNING_KEY:
+        await revocations.sync()
+        run_in_background(sync_revocations_forever())
+    run_in_background(audit_log.flush_forever())
+    startup_state["ready"] = True
+    logger.info(f"Startup finished in {(time.perf_counter() - started) * 1000:.0f} ms")
+
 async def shutdown_db_client():
-    client.close()
+    for task in list(_background_tasks):
+        task.cancel()
+    if MULTI_WORKER:
+        # Hand leadership over now instead of after the lease expires
+        try:
+            await leader_lease.release()
+        except Exception as e:
+            logger.error(f"Releasing leader lease failed: {e}")
+    leader_lease.held = False
+    try:
+        await audit_log.flush()
+    except Exception as e:
+        logger.error(f"Final audit log flush failed: {e}")
+    if client is not None:
+        client.close()
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False)
 
 ALLOWED_ORIGINS = [
     "https://emergent-app-zeta.vercel.app",
@@ -996,19 +3926,63 @@ ALLOWED_ORIGINS = [
     "http://localhost:3000",
 ]
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=ALLOWED_ORIGINS,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
 # Root endpoint
 @api_router.get("/")
 async def root():
     return {"message": "BORKA API", "version": "1.0.0"}
 
-# Include router
-app.include_router(api_router)
+@api_router.get("/health/ready")
+async def readiness():
+    """Readiness probe: 200 once startup has finished, indexes may still be building"""
+    if not startup_state["ready"]:
+        return ORJSONResponse(status_code=503, content={"status": "starting", **startup_state})
+    return {"status": "ready", **startup_state}
+
+@api_router.get("/admin/metrics/db-pool")
+async def db_pool_metrics(request: Request):
+    """MongoDB connection pool usage and saturation (admin only)"""
+    await require_admin(request)
+    return {
+        **pool_metrics.snapshot(),
+        "compressors": available_compressors(),
+        "public_read_preference": MONGO_PUBLIC_READ_PREFERENCE,
+    }
+
+def create_app(database=None) -> FastAPI:
+    """Build the application.
+
+    The Mongo client is opened in the lifespan rather than at import, so
+    importing this module needs neither MONGO_URL nor a reachable server.
+    Pass `database` to run against an already configured database.
+    """
+
+    @asynccontextmanager
+    async def lifespan(application: FastAPI):
+        global db, public_db
+        if database is not None:
+            db, public_db = database, None
+        elif db is None:
+            connect_database()
+        await startup_event()
+        yield
+        await shutdown_db_client()
+
+    application = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+
+    application.add_middleware(CompressionMiddleware)
+    application.add_middleware(SessionCookieMiddleware)
+
+    # CORS middleware
+    application.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_origins=ALLOWED_ORIGINS,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Include router
+    application.include_router(api_router)
+    return application
+
+app = create_app()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+BORKA Backend Multi-Worker Tests
+Starts several backend workers locally against one MongoDB database and
+checks seeding, leader election and cross-worker cache invalidation.
+
+Requires a reachable MongoDB (MONGO_URL, default mongodb://localhost:27017).
+Each run uses a fresh database that is dropped afterwards.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import requests
+from pymongo import MongoClient
+
+BACKEND_DIR = Path(__file__).resolve().parent / "backend"
+MONGO_URL = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
+DB_NAME = f"borka_multiworker_{uuid.uuid4().hex[:8]}"
+ADMIN_EMAIL = "admin@borka.se"
+ADMIN_PASSWORD = "asdqwe123"
+WORKERS = 3
+BASE_PORT = 8101
+LEASE_TTL_SECONDS = 3
+
+workers = {}  # port -> Popen
+
+
+def start_worker(port):
+    env = {
+        **os.environ,
+        "MONGO_URL": MONGO_URL,
+        "DB_NAME": DB_NAME,
+        "ADMIN_EMAIL": ADMIN_EMAIL,
+        "ADMIN_PASSWORD": ADMIN_PASSWORD,
+        "MULTI_WORKER": "1",
+        "LEASE_TTL_SECONDS": str(LEASE_TTL_SECONDS),
+        "CHANGE_POLL_MS": "200",
+    }
+    workers[port] = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def url(port, path):
+    return f"http://127.0.0.1:{port}/api{path}"
+
+
+def wait_ready(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(url(port, "/health/ready"), timeout=1).status_code == 200:
+                return True
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.2)
+    return False
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def admin_headers(port):
+    response = requests.post(url(port, "/auth/login"), json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['session_token']}"}
+
+
+def test_concurrent_cold_boot(db):
+    """All workers boot together on an empty database; seeding must happen once"""
+    print("🧪 Testing concurrent cold boot...")
+    ports = [BASE_PORT + i for i in range(WORKERS)]
+    for port in ports:
+        start_worker(port)
+    ready = all(wait_ready(port) for port in ports)
+    categories = db.categories.count_documents({})
+    admins = db.users.count_documents({"email": ADMIN_EMAIL})
+    events = db.events.count_documents({})
+    print(f"   Ready: {ready}, categories: {categories}, admins: {admins}, sample events: {events}")
+    return ready and categories == 4 and admins == 1 and events == 2
+
+
+def test_single_leader(db):
+    """Exactly one worker holds the leader lease"""
+    print("🧪 Testing leader election...")
+    lease = None
+    if wait_for(lambda: db.leases.find_one({"_id": "leader"}) is not None):
+        lease = db.leases.find_one({"_id": "leader"})
+    print(f"   Leader: {lease and lease['holder']}")
+    return lease is not None
+
+
+def test_leader_failover(db):
+    """Killing the leader hands the lease to another worker within the TTL"""
+    print("🧪 Testing leader failover...")
+    holder = db.leases.find_one({"_id": "leader"})["holder"]
+    pid = int(holder.split(":")[1])
+    port = next((p for p, proc in workers.items() if proc.pid == pid), None)
+    if port is None:
+        print(f"   Error: no worker with pid {pid}")
+        return False
+    workers.pop(port).kill()
+    took_over = wait_for(
+        lambda: (db.leases.find_one({"_id": "leader"}) or {}).get("holder", holder) != holder,
+        timeout=LEASE_TTL_SECONDS * 3,
+    )
+    new_holder = (db.leases.find_one({"_id": "leader"}) or {}).get("holder")
+    print(f"   Killed worker on port {port}, new leader: {new_holder}")
+    return took_over
+
+
+def test_cache_invalidation():
+    """A write on one worker shows up in another worker's cached event list"""
+    print("🧪 Testing cross-worker cache invalidation...")
+    writer, reader = list(workers)[:2]
+    headers = admin_headers(writer)
+    before = requests.get(url(reader, "/events")).json()  # warms the reader's cache
+    start = datetime.now(timezone.utc) + timedelta(days=3)
+    created = requests.post(url(writer, "/events"), headers=headers, json={
+        "title": "Flerprocesstest",
+        "description": "Skapad via en annan worker",
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=2)).isoformat(),
+        "category": "tournament",
+    }).json()
+    seen = wait_for(lambda: any(e["id"] == created["id"] for e in requests.get(url(reader, "/events")).json()))
+    print(f"   Events before: {len(before)}, new event visible on port {reader}: {seen}")
+    return seen
+
+
+def test_sse_across_workers():
+    """An SSE client on one worker receives changes written through another"""
+    print("🧪 Testing SSE fan-out across workers...")
+    writer, reader = list(workers)[:2]
+    headers = admin_headers(writer)
+    received = threading.Event()
+
+    def listen():
+        with requests.get(url(reader, "/stream"), stream=True, timeout=15) as response:
+            for line in response.iter_lines(decode_unicode=True):
+                if line and "Multiworker-nyhet" in line:
+                    received.set()
+                    return
+
+    listener = threading.Thread(target=listen, daemon=True)
+    listener.start()
+    time.sleep(0.5)
+    requests.post(url(writer, "/news"), headers=headers, json={"title": "Multiworker-nyhet", "body": "Hej"})
+    ok = received.wait(timeout=10)
+    print(f"   Change delivered to SSE client on port {reader}: {ok}")
+    return ok
+
+
+def main():
+    print("=" * 60)
+    print("BORKA MULTI-WORKER TESTS")
+    print("=" * 60)
+    print(f"MongoDB: {MONGO_URL}, database: {DB_NAME}, workers: {WORKERS}")
+    print("\n")
+
+    mongo = MongoClient(MONGO_URL)
+    db = mongo[DB_NAME]
+    results = []
+    try:
+        results.append(("Concurrent Cold Boot Seeds Once", test_concurrent_cold_boot(db)))
+        results.append(("Single Leader", test_single_leader(db)))
+        results.append(("Cross-Worker Cache Invalidation", test_cache_invalidation()))
+        results.append(("SSE Across Workers", test_sse_across_workers()))
+        results.append(("Leader Failover", test_leader_failover(db)))
+    finally:
+        for proc in workers.values():
+            proc.terminate()
+        for proc in workers.values():
+            proc.wait(timeout=10)
+        mongo.drop_database(DB_NAME)
+
+    print("=" * 60)
+    print("MULTI-WORKER TEST SUMMARY")
+    print("=" * 60)
+
+    passed = 0
+    for test_name, success in results:
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status} {test_name}")
+        if success:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
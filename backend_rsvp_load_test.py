@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+BORKA Backend RSVP Load Test
+Fires concurrent sign-ups at one capacity-limited event and checks that it is
+never overbooked and that the counters on the event match the attendance rows.
+
+Runs against a live backend (BASE_URL, default http://localhost:8001/api).
+Every member logs in from this machine, so start the server with a raised
+login limit, e.g. LOGIN_IP_BURST=1000.
+"""
+
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:8001/api")
+ADMIN_EMAIL = os.environ.get("ADMIN_EMAIL", "admin@borka.se")
+ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "asdqwe123")
+MEMBERS = int(os.environ.get("RSVP_MEMBERS", "200"))
+CAPACITY = int(os.environ.get("RSVP_CAPACITY", "25"))
+THREADS = int(os.environ.get("RSVP_THREADS", "50"))
+MEMBER_PASSWORD = "rsvp-load-test"
+
+
+def login(email, password):
+    response = requests.post(f"{BASE_URL}/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['session_token']}"}
+
+
+def create_members(admin):
+    run = uuid.uuid4().hex[:8]
+    users = [
+        {"email": f"rsvp-{run}-{i}@loadtest.borka.se", "name": f"Lasttest {i}", "password": MEMBER_PASSWORD}
+        for i in range(MEMBERS)
+    ]
+    response = requests.post(f"{BASE_URL}/admin/users/bulk", headers=admin, json=users)
+    response.raise_for_status()
+    results = response.json()["results"]
+    failed = [r for r in results if r["status"] != "created"]
+    if failed:
+        raise RuntimeError(f"{len(failed)} members not created, first: {failed[0]}")
+    return [(r["email"], r["user_id"]) for r in results]
+
+
+def create_event(admin):
+    start = datetime.now(timezone.utc) + timedelta(days=7)
+    response = requests.post(f"{BASE_URL}/events", headers=admin, json={
+        "title": "RSVP-lasttest",
+        "description": "Skapad av backend_rsvp_load_test.py",
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(hours=3)).isoformat(),
+        "category": "tournament",
+        "capacity": CAPACITY,
+    })
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+def test_concurrent_signups(admin, event_id, sessions):
+    """Every member joins at once; exactly CAPACITY get a seat"""
+    print(f"🧪 Testing {len(sessions)} concurrent sign-ups for {CAPACITY} seats...")
+
+    def join(headers):
+        return requests.post(f"{BASE_URL}/events/{event_id}/rsvp", headers=headers)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        responses = list(pool.map(join, sessions))
+    elapsed = time.perf_counter() - started
+
+    statuses = [r.json().get("status") if r.status_code == 200 else r.status_code for r in responses]
+    going = statuses.count("going")
+    waitlisted = statuses.count("waitlisted")
+    event = requests.get(f"{BASE_URL}/events/{event_id}").json()
+    attendees = requests.get(f"{BASE_URL}/events/{event_id}/attendees", headers=admin).json()
+    print(f"   {len(responses)} requests in {elapsed:.2f}s ({len(responses) / elapsed:.0f} req/s)")
+    print(f"   Going: {going}, waitlisted: {waitlisted}, other: {len(statuses) - going - waitlisted}")
+    print(f"   Event counters: {event['attendee_count']} going, {event['waitlist_count']} waitlisted")
+    return (
+        going == CAPACITY
+        and waitlisted == len(sessions) - CAPACITY
+        and event["attendee_count"] == len(attendees["attendees"]) == CAPACITY
+        and event["waitlist_count"] == len(attendees["waitlist"]) == waitlisted
+    )
+
+
+def test_duplicate_signups(event_id, sessions):
+    """Joining again concurrently doesn't change any counter"""
+    print("🧪 Testing concurrent duplicate sign-ups...")
+    before = requests.get(f"{BASE_URL}/events/{event_id}").json()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        list(pool.map(lambda h: requests.post(f"{BASE_URL}/events/{event_id}/rsvp", headers=h), sessions[:THREADS] * 2))
+    after = requests.get(f"{BASE_URL}/events/{event_id}").json()
+    print(f"   Before: {before['attendee_count']}/{before['waitlist_count']}, after: {after['attendee_count']}/{after['waitlist_count']}")
+    return (before["attendee_count"], before["waitlist_count"]) == (after["attendee_count"], after["waitlist_count"])
+
+
+def test_concurrent_leave(event_id, sessions):
+    """Everyone leaves at once; counters return to zero"""
+    print("🧪 Testing concurrent cancellations...")
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        list(pool.map(lambda h: requests.delete(f"{BASE_URL}/events/{event_id}/rsvp", headers=h), sessions))
+    event = requests.get(f"{BASE_URL}/events/{event_id}").json()
+    print(f"   Event counters: {event['attendee_count']} going, {event['waitlist_count']} waitlisted")
+    return event["attendee_count"] == 0 and event["waitlist_count"] == 0
+
+
+def main():
+    print("=" * 60)
+    print("BORKA RSVP LOAD TEST")
+    print("=" * 60)
+    print(f"Backend: {BASE_URL}, members: {MEMBERS}, capacity: {CAPACITY}, threads: {THREADS}")
+    print("\n")
+
+    admin = login(ADMIN_EMAIL, ADMIN_PASSWORD)
+    members = create_members(admin)
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        sessions = list(pool.map(lambda m: login(m[0], MEMBER_PASSWORD), members))
+    event_id = create_event(admin)
+
+    results = []
+    try:
+        results.append(("Concurrent Sign-ups Respect Capacity", test_concurrent_signups(admin, event_id, sessions)))
+        results.append(("Duplicate Sign-ups Are Idempotent", test_duplicate_signups(event_id, sessions)))
+        results.append(("Concurrent Cancellations", test_concurrent_leave(event_id, sessions)))
+    finally:
+        requests.delete(f"{BASE_URL}/events/{event_id}", headers=admin)
+        for _, user_id in members:
+            requests.delete(f"{BASE_URL}/admin/users/{user_id}", headers=admin)
+
+    print("=" * 60)
+    print("RSVP LOAD TEST SUMMARY")
+    print("=" * 60)
+
+    passed = 0
+    for test_name, success in results:
+        status = "✅ PASS" if success else "❌ FAIL"
+        print(f"{status} {test_name}")
+        if success:
+            passed += 1
+
+    print(f"\nOverall: {passed}/{len(results)} tests passed")
+    return passed == len(results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
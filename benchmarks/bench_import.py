@@ -0,0 +1,72 @@
+"""Import-time benchmark for the backend module.
+
+Runs `python -X importtime -c "import server"` in fresh interpreters
+without MONGO_URL set (importing must not need a database), and reports
+the median total plus the heaviest top-level imports. Worker spawn and
+test collection both pay this cost.
+
+    python benchmarks/bench_import.py [--runs 5] [--budget-ms 800]
+
+With --budget-ms the script exits non-zero when the median exceeds it.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+# Must stay lazy: imported on first use, not when the module loads
+LAZY_MODULES = ("motor", "httpx", "exponent_server_sdk", "bcrypt")
+
+
+def parse_line(line):
+    fields = line[len("import time:"):].split("|")
+    return int(fields[0]), int(fields[1]), fields[2]
+
+
+def profile():
+    env = {k: v for k, v in os.environ.items() if k not in ("MONGO_URL", "DB_NAME")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    entries = [parse_line(line) for line in result.stderr.splitlines()
+               if line.startswith("import time:") and "cumulative" not in line]
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    runs = [profile() for _ in range(args.runs)]
+    totals = [next(cumulative for _, cumulative, name in entries if name.strip() == "server") / 1000
+              for entries in runs]
+    median = statistics.median(totals)
+    print(f"import server: median {median:.0f} ms over {args.runs} runs "
+          f"(min {min(totals):.0f}, max {max(totals):.0f})")
+
+    last = runs[-1]
+    # Direct children of `server` are indented by exactly three spaces
+    top_level = sorted(((cumulative, name.strip()) for _, cumulative, name in last
+                        if name.startswith("   ") and not name.startswith("    ")), reverse=True)
+    print("heaviest imports:")
+    for cumulative, name in top_level[:10]:
+        print(f"  {name:<32} {cumulative / 1000:7.1f} ms")
+
+    loaded = {name.strip().split(".")[0] for _, _, name in last}
+    eager = [module for module in LAZY_MODULES if module in loaded]
+    if eager:
+        print(f"FAIL: imported eagerly: {', '.join(eager)}")
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"FAIL: median {median:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+    if eager or (args.budget_ms is not None and median > args.budget_ms):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
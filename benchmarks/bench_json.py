@@ -0,0 +1,83 @@
+"""Micro-benchmark: encoding get_events / get_news shaped payloads.
+
+Compares the stock FastAPI path (jsonable_encoder + json.dumps), the
+ORJSONResponse default class, encoding straight from Mongo documents with
+orjson, and serving the pre-encoded cached bytes.
+
+    python benchmarks/bench_json.py
+"""
+import json
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from server import encode_json, json_bytes_response  # noqa: E402
+
+ROUNDS = 200
+
+
+def make_events(n=100):
+    # Motor hands back naive UTC datetimes with millisecond precision
+    base = datetime(2030, 1, 1, 18, 0, 0, 123000)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Spelkväll {i}",
+            "description": "Kom och spela brädspel med oss! " * 4,
+            "location": "Odengatan 31, Sandviken",
+            "start_time": base + timedelta(days=i),
+            "end_time": base + timedelta(days=i, hours=4),
+            "category": "open_game_night",
+            "series_id": None,
+            "created_by": "user_admin",
+            "created_at": base,
+            "updated_at": base,
+        }
+        for i in range(n)
+    ]
+
+
+def make_news(n=100):
+    base = datetime(2030, 1, 1, 12, 0, 0, 456000)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Nyhet {i}",
+            "body": "BORKA har fått nya spel till hyllan. " * 10,
+            "image": None,
+            "publish_date": base - timedelta(days=i),
+            "created_by": "user_admin",
+            "created_at": base,
+        }
+        for i in range(n)
+    ]
+
+
+def bench(name, docs):
+    cached = encode_json(docs)
+    # Same JSON as before, datetime strings included
+    assert json.loads(cached) == json.loads(JSONResponse(jsonable_encoder(docs)).body)
+
+    cases = {
+        "jsonable_encoder + JSONResponse": lambda: JSONResponse(jsonable_encoder(docs)).body,
+        "jsonable_encoder + ORJSONResponse": lambda: ORJSONResponse(jsonable_encoder(docs)).body,
+        "orjson from documents (cache miss)": lambda: json_bytes_response(encode_json(docs)).body,
+        "pre-encoded bytes (cache hit)": lambda: json_bytes_response(cached).body,
+    }
+    print(f"{name}: {len(docs)} documents, {len(cached)} bytes")
+    baseline = None
+    for label, fn in cases.items():
+        per_call = min(timeit.repeat(fn, number=ROUNDS, repeat=5)) / ROUNDS
+        baseline = baseline or per_call
+        print(f"  {label:<38} {per_call * 1e6:9.1f} µs  {baseline / per_call:6.1f}x")
+
+
+if __name__ == "__main__":
+    bench("get_events", make_events())
+    bench("get_news", make_news())
@@ -0,0 +1,109 @@
+"""Micro-benchmark: per-request model work on the auth and create paths.
+
+"before" reproduces what the handlers used to do (a full User model for
+the principal, Event dumped three times and the response run through
+jsonable_encoder); "after" is the current code path. The trusted-document
+case compares validating stored data with model_construct, which on
+pydantic 2.x turns out to be the slower of the two, so handlers keep
+validating. Database I/O is left out.
+
+    python benchmarks/bench_models.py
+"""
+import json
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from server import Event, EventCreate, Principal, User, encode_json  # noqa: E402
+
+ROUNDS = 5000
+
+USER_DOC = {
+    "user_id": "user_0123456789ab",
+    "email": "medlem@borka.se",
+    "name": "Medlem",
+    "picture": None,
+    "role": "admin",
+    "phone": None,
+    "notification_preferences": {
+        "enabled": True,
+        "categories": {"open_game_night": True, "member_night": False, "tournament": True,
+                       "special_event": False, "news": True},
+        "reminder_times": ["24h"],
+    },
+    "push_token": None,
+    "created_at": datetime(2025, 1, 1, 12, 0),
+}
+
+EVENT_BODY = EventCreate(
+    title="Spelkväll",
+    description="Kom och spela brädspel med oss!",
+    start_time=datetime(2030, 1, 1, 18, tzinfo=timezone.utc),
+    end_time=datetime(2030, 1, 1, 22, tzinfo=timezone.utc),
+    category="open_game_night",
+)
+
+
+def auth_before():
+    user = User(**USER_DOC)
+    return user.role == "admin" and user.user_id
+
+
+def auth_after():
+    user = Principal(USER_DOC["user_id"], USER_DOC["email"], USER_DOC["role"])
+    return user.role == "admin" and user.user_id
+
+
+def profile_validate():
+    return User(**USER_DOC).model_dump()
+
+
+def profile_construct():
+    return User.model_construct(**USER_DOC).model_dump()
+
+
+def json_response_body(content):
+    # What fastapi.responses.JSONResponse.render does
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def create_before():
+    event_doc = Event(**EVENT_BODY.model_dump(), created_by="user_0123456789ab")
+    event_doc.model_dump()  # insert_one
+    event_doc.model_dump()  # record_change
+    return json_response_body(jsonable_encoder(event_doc.model_dump()))
+
+
+def create_after():
+    event_doc = Event(**EVENT_BODY.model_dump(), created_by="user_0123456789ab")
+    doc = event_doc.model_dump()
+    dict(doc)  # insert_one copy
+    return encode_json(doc)
+
+
+def peak_allocation(fn):
+    """Peak bytes allocated by one call, measured with tracemalloc"""
+    fn()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def bench(name, **cases):
+    print(name)
+    for label, fn in cases.items():
+        cpu = min(timeit.repeat(fn, number=ROUNDS, repeat=5)) / ROUNDS
+        print(f"  {label:<15} {cpu * 1e6:8.2f} µs/request  {peak_allocation(fn):6d} B allocated/request")
+
+
+if __name__ == "__main__":
+    bench("require_auth / require_admin principal", before=auth_before, after=auth_after)
+    bench("trusted user document + model_dump", validate=profile_validate, model_construct=profile_construct)
+    bench("create_event model work", before=create_before, after=create_after)
@@ -15,25 +15,25 @@ import { Ionicons } from '@expo/vector-icons';
 import { format } from 'date-fns';
 import { sv } from 'date-fns/locale';
 import { Colors, CategoryColors, CategoryNames } from '../../src/constants/colors';
-import { useDataStore, Event } from '../../src/stores/dataStore';
+import { useDataStore, HomeEvent } from '../../src/stores/dataStore';
 import { Button } from '../../src/components/Button';
 
 export default function HomeScreen() {
   const router = useRouter();
-  const { events, fetchEvents, isLoadingEvents, fetchCategories } = useDataStore();
+  const { home, fetchHome } = useDataStore();
   const [refreshing, setRefreshing] = React.useState(false);
 
   useEffect(() => {
-    Promise.all([fetchEvents(), fetchCategories()]);
+    fetchHome();
   }, []);
 
   const onRefresh = async () => {
     setRefreshing(true);
-    await fetchEvents();
+    await fetchHome();
     setRefreshing(false);
   };
 
-  const nextEvent = events.length > 0 ? events[0] : null;
+  const nextEvent = home?.next_event ?? null;
 
   return (
     <SafeAreaView style={styles.container} edges={['top']}>
@@ -135,7 +135,7 @@ export default function HomeScreen() {
   );
 }
 
-function NextEventCard({ event, onPress }: { event: Event; onPress: () => void }) {
+function NextEventCard({ event, onPress }: { event: HomeEvent; onPress: () => void }) {
   const startDate = new Date(event.start_time);
   const categoryColor = CategoryColors[event.category] || Colors.primary;
   const categoryName = CategoryNames[event.category] || event.category;
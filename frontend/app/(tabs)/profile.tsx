@@ -23,7 +23,7 @@ const API_URL = process.env.EXPO_PUBLIC_BACKEND_URL || '';
 
 export default function ProfileScreen() {
   const router = useRouter();
-  const { user, isAuthenticated, logout, updateUser, loginWithEmail, error, setError } = useAuthStore();
+  const { user, sessionToken, isAuthenticated, logout, updateUser, loginWithEmail, error, setError } = useAuthStore();
   const [email, setEmail] = useState('');
   const [password, setPassword] = useState('');
   const [isSubmitting, setIsSubmitting] = useState(false);
@@ -110,8 +110,20 @@ const handleEmailAuth = async () => {
     }
   };
 
-  const handleSubscribeCalendar = () => {
-    const icsUrl = `${API_URL}/api/calendar/ics`;
+  const handleSubscribeCalendar = async () => {
+    // Personal feed follows the member's category choices; fall back to the full feed
+    let icsUrl = `${API_URL}/api/calendar/ics`;
+    try {
+      const response = await fetch(`${API_URL}/api/users/me/calendar-feed`, {
+        headers: { Authorization: `Bearer ${sessionToken}` },
+      });
+      if (response.ok) {
+        const feed = await response.json();
+        icsUrl = `${API_URL}${feed.path}`;
+      }
+    } catch (error) {
+      console.error('Calendar feed error:', error);
+    }
     const webcalUrl = icsUrl.replace('https://', 'webcal://').replace('http://', 'webcal://');
     const googleUrl = `https://calendar.google.com/calendar/r?cid=${encodeURIComponent(icsUrl)}`;
 
@@ -120,7 +132,7 @@ const handleEmailAuth = async () => {
     } else {
       Alert.alert(
         'Prenumerera på kalendern',
-        'Alla BORKA-event läggs till automatiskt och hålls uppdaterade.',
+        'BORKA-event i dina valda kategorier läggs till automatiskt och hålls uppdaterade.',
         [
           { text: 'iPhone (Apple Kalender)', onPress: () => Linking.openURL(webcalUrl) },
           { text: 'Android (Google Kalender)', onPress: () => Linking.openURL(googleUrl) },
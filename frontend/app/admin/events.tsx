@@ -17,7 +17,7 @@ import { Ionicons } from '@expo/vector-icons';
 import { format } from 'date-fns';
 import { sv } from 'date-fns/locale';
 import { Colors, CategoryColors, CategoryNames } from '../../src/constants/colors';
-import { useDataStore, Event, Category } from '../../src/stores/dataStore';
+import { useDataStore, Event, Category, ConflictError } from '../../src/stores/dataStore';
 import { useAuthStore } from '../../src/stores/authStore';
 import { Button } from '../../src/components/Button';
 
@@ -86,7 +86,7 @@ function DateField({ label, value, onChange }: { label: string; value: string; o
 export default function AdminEventsScreen() {
   const router = useRouter();
   const { user } = useAuthStore();
-  const { events, fetchEvents, categories, fetchCategories, createEvent, updateEvent, deleteEvent, createEventRaw, updateEventRaw, deleteEventRaw } = useDataStore();
+  const { events, fetchEvents, categories, fetchCategories, createEvent, updateEvent, deleteEvent, restoreEvent, createEventRaw, updateEventRaw, deleteEventRaw } = useDataStore();
   const [modalVisible, setModalVisible] = useState(false);
   const [editingEvent, setEditingEvent] = useState<Event | null>(null);
   const [formData, setFormData] = useState({
@@ -200,6 +200,11 @@ export default function AdminEventsScreen() {
       setModalVisible(false);
       setEditingSeriesEvents([]);
     } catch (error) {
+      if (error instanceof ConflictError) {
+        Alert.alert('Ändrat av någon annan', `${error.message}. Öppna och spara igen för att se de senaste ändringarna.`);
+        setModalVisible(false);
+        return;
+      }
       Alert.alert('Fel', 'Något gick fel');
     }
   };
@@ -226,7 +231,13 @@ export default function AdminEventsScreen() {
     Alert.alert('Ta bort event', `Är du säker på att du vill ta bort "${event.title}"?`, [
       { text: 'Avbryt', style: 'cancel' },
       { text: 'Ta bort', style: 'destructive', onPress: async () => {
-        try { await deleteEvent(event.id); Alert.alert('Klart', 'Event borttaget'); }
+        try {
+          await deleteEvent(event.id);
+          Alert.alert('Klart', 'Event borttaget', [
+            { text: 'Ångra', onPress: () => restoreEvent(event.id).catch(() => Alert.alert('Fel', 'Kunde inte återställa eventet')) },
+            { text: 'OK' },
+          ]);
+        }
         catch (error) { Alert.alert('Fel', 'Kunde inte ta bort eventet'); }
       }},
     ]);
@@ -15,13 +15,13 @@ import { Ionicons } from '@expo/vector-icons';
 import { format } from 'date-fns';
 import { sv } from 'date-fns/locale';
 import { Colors } from '../../src/constants/colors';
-import { useDataStore, News } from '../../src/stores/dataStore';
+import { useDataStore, News, ConflictError } from '../../src/stores/dataStore';
 import { useAuthStore } from '../../src/stores/authStore';
 
 export default function AdminNewsScreen() {
   const router = useRouter();
   const { user } = useAuthStore();
-  const { news, fetchNews, createNews, updateNews, deleteNews } = useDataStore();
+  const { news, fetchNews, createNews, updateNews, deleteNews, restoreNews } = useDataStore();
   const [modalVisible, setModalVisible] = useState(false);
   const [editingNews, setEditingNews] = useState<News | null>(null);
   const [formData, setFormData] = useState({
@@ -84,6 +84,11 @@ export default function AdminNewsScreen() {
       }
       setModalVisible(false);
     } catch (error) {
+      if (error instanceof ConflictError) {
+        Alert.alert('Ändrat av någon annan', `${error.message}. Öppna och spara igen för att se de senaste ändringarna.`);
+        setModalVisible(false);
+        return;
+      }
       Alert.alert('Fel', 'Något gick fel');
     }
   };
@@ -100,7 +105,10 @@ export default function AdminNewsScreen() {
           onPress: async () => {
             try {
               await deleteNews(item.id);
-              Alert.alert('Klart', 'Nyhet borttagen');
+              Alert.alert('Klart', 'Nyhet borttagen', [
+                { text: 'Ångra', onPress: () => restoreNews(item.id).catch(() => Alert.alert('Fel', 'Kunde inte återställa nyheten')) },
+                { text: 'OK' },
+              ]);
             } catch (error) {
               Alert.alert('Fel', 'Kunde inte ta bort nyheten');
             }
@@ -16,7 +16,8 @@ import { Ionicons } from '@expo/vector-icons';
 import { format } from 'date-fns';
 import { sv } from 'date-fns/locale';
 import { Colors, CategoryColors, CategoryNames } from '../../src/constants/colors';
-import { Event } from '../../src/stores/dataStore';
+import { Event, Rsvp } from '../../src/stores/dataStore';
+import { useAuthStore } from '../../src/stores/authStore';
 import { Button } from '../../src/components/Button';
 
 const API_URL = process.env.EXPO_PUBLIC_BACKEND_URL || '';
@@ -26,11 +27,47 @@ export default function EventDetailScreen() {
   const { id } = useLocalSearchParams<{ id: string }>();
   const [event, setEvent] = useState<Event | null>(null);
   const [loading, setLoading] = useState(true);
+  const [rsvp, setRsvp] = useState<Rsvp | null>(null);
+  const [rsvpLoading, setRsvpLoading] = useState(false);
+  const { sessionToken, isAuthenticated } = useAuthStore();
 
   useEffect(() => {
     fetchEvent();
   }, [id]);
 
+  useEffect(() => {
+    if (isAuthenticated) fetchRsvp();
+  }, [id, isAuthenticated]);
+
+  const fetchRsvp = async () => {
+    try {
+      const response = await fetch(`${API_URL}/api/events/${id}/rsvp`, {
+        headers: { Authorization: `Bearer ${sessionToken}` },
+      });
+      if (response.ok) setRsvp(await response.json());
+    } catch (error) {
+      console.error('Error fetching RSVP:', error);
+    }
+  };
+
+  const handleRsvp = async () => {
+    if (!rsvp) return;
+    setRsvpLoading(true);
+    try {
+      const response = await fetch(`${API_URL}/api/events/${id}/rsvp`, {
+        method: rsvp.status === 'none' ? 'POST' : 'DELETE',
+        headers: { Authorization: `Bearer ${sessionToken}` },
+      });
+      const data = await response.json();
+      if (!response.ok) throw new Error(data.detail || 'RSVP failed');
+      setRsvp(data);
+    } catch (error: any) {
+      Alert.alert('Fel', error.message || 'Kunde inte uppdatera anmälan');
+    } finally {
+      setRsvpLoading(false);
+    }
+  };
+
   const fetchEvent = async () => {
     try {
       const response = await fetch(`${API_URL}/api/events/${id}`);
@@ -159,6 +196,37 @@ export default function EventDetailScreen() {
           </TouchableOpacity>
         </View>
 
+        {/* Attendance */}
+        {rsvp && (
+          <View style={styles.descriptionSection}>
+            <Text style={styles.sectionTitle}>Anmälan</Text>
+            <Text style={styles.description}>
+              {rsvp.capacity
+                ? `${rsvp.attendee_count} av ${rsvp.capacity} platser tagna`
+                : `${rsvp.attendee_count} anmälda`}
+              {rsvp.waitlist_count > 0 ? `, ${rsvp.waitlist_count} på väntelistan` : ''}
+            </Text>
+            {rsvp.status === 'waitlisted' && (
+              <Text style={styles.description}>Du är nummer {rsvp.waitlist_position} på väntelistan</Text>
+            )}
+            <Button
+              title={
+                rsvp.status === 'going'
+                  ? 'Avanmäl'
+                  : rsvp.status === 'waitlisted'
+                    ? 'Lämna väntelistan'
+                    : rsvp.capacity && rsvp.attendee_count >= rsvp.capacity
+                      ? 'Ställ dig på väntelistan'
+                      : 'Anmäl dig'
+              }
+              variant={rsvp.status === 'none' ? 'primary' : 'outline'}
+              loading={rsvpLoading}
+              onPress={handleRsvp}
+              style={styles.rsvpButton}
+            />
+          </View>
+        )}
+
         {/* Description */}
         <View style={styles.descriptionSection}>
           <Text style={styles.sectionTitle}>Beskrivning</Text>
@@ -309,4 +377,7 @@ const styles = StyleSheet.create({
     borderTopWidth: 1,
     borderTopColor: Colors.divider,
   },
+  rsvpButton: {
+    marginTop: 12,
+  },
 });
@@ -13,21 +13,42 @@ export interface Event {
   end_time: string;
   category: string;
   series_id?: string;
+  capacity?: number | null;
+  attendee_count?: number;
+  waitlist_count?: number;
+  version?: number;
   created_by: string;
   created_at: string;
   updated_at: string;
 }
 
+export interface Rsvp {
+  event_id: string;
+  status: 'none' | 'going' | 'waitlisted';
+  waitlist_position: number | null;
+  capacity: number | null;
+  attendee_count: number;
+  waitlist_count: number;
+}
+
 export interface News {
   id: string;
   title: string;
   body: string;
   image?: string;
   publish_date: string;
+  version?: number;
   created_by: string;
   created_at: string;
 }
 
+// Thrown when someone else changed the same fields since the item was loaded
+export class ConflictError extends Error {
+  constructor(message: string, public current: any) {
+    super(message);
+  }
+}
+
 export interface Category {
   id: string;
   name: string;
@@ -35,13 +56,32 @@ export interface Category {
   color: string;
 }
 
+export type HomeEvent = Pick<Event, 'id' | 'title' | 'category' | 'start_time' | 'end_time' | 'location'>;
+
+export interface HomeNews {
+  id: string;
+  title: string;
+  summary: string;
+  has_image: boolean;
+  publish_date: string;
+}
+
+export interface HomeSnapshot {
+  next_event: HomeEvent | null;
+  upcoming: Record<string, HomeEvent[]>;
+  news: HomeNews[];
+  categories: Category[];
+}
+
 interface DataState {
   events: Event[];
   news: News[];
   categories: Category[];
+  home: HomeSnapshot | null;
   isLoadingEvents: boolean;
   isLoadingNews: boolean;
   
+  fetchHome: () => Promise<void>;
   fetchEvents: (category?: string) => Promise<void>;
   fetchNews: () => Promise<void>;
   fetchCategories: () => Promise<void>;
@@ -49,6 +89,7 @@ interface DataState {
   createEvent: (event: Omit<Event, 'id' | 'created_at' | 'updated_at' | 'created_by'>) => Promise<void>;
   updateEvent: (id: string, updates: Partial<Event>) => Promise<void>;
   deleteEvent: (id: string) => Promise<void>;
+  restoreEvent: (id: string) => Promise<void>;
   createEventRaw: (event: Omit<Event, 'id' | 'created_at' | 'updated_at' | 'created_by'>) => Promise<void>;
   updateEventRaw: (id: string, updates: Partial<Event>) => Promise<void>;
   deleteEventRaw: (id: string) => Promise<void>;
@@ -56,6 +97,7 @@ interface DataState {
   createNews: (news: Omit<News, 'id' | 'created_at' | 'publish_date' | 'created_by'>) => Promise<void>;
   updateNews: (id: string, updates: Partial<News>) => Promise<void>;
   deleteNews: (id: string) => Promise<void>;
+  restoreNews: (id: string) => Promise<void>;
 }
 
 // In-memory token cache — set by authStore after login/checkAuth to avoid
@@ -70,13 +112,56 @@ const getAuthHeader = async () => {
   return token ? { 'Authorization': `Bearer ${token}` } : {};
 };
 
+// Only the fields that differ from the stored copy, so edits to different
+// fields by two admins merge on the server instead of overwriting each other
+const changedFields = (original: Record<string, any> | undefined, updates: Record<string, any>) => {
+  if (!original) return updates;
+  return Object.fromEntries(Object.entries(updates).filter(([key, value]) =>
+    key.endsWith('_time') && value && original[key]
+      ? new Date(value).getTime() !== new Date(original[key]).getTime()
+      : value !== original[key]
+  ));
+};
+
+const putVersioned = async (url: string, original: { version?: number } | undefined, updates: Record<string, any>) => {
+  const headers = await getAuthHeader();
+  const response = await fetch(url, {
+    method: 'PUT',
+    headers: {
+      'Content-Type': 'application/json',
+      ...(original?.version ? { 'If-Match': `"${original.version}"` } : {}),
+      ...headers,
+    },
+    body: JSON.stringify(changedFields(original, updates)),
+  });
+  if (response.status === 409) {
+    const conflict = await response.json();
+    throw new ConflictError(conflict.detail, conflict.current);
+  }
+  if (!response.ok) throw new Error('Failed to update');
+  return response.json();
+};
+
 export const useDataStore = create<DataState>((set, get) => ({
   events: [],
   news: [],
   categories: [],
+  home: null,
   isLoadingEvents: false,
   isLoadingNews: false,
   
+  fetchHome: async () => {
+    try {
+      const response = await fetch(`${API_URL}/api/home`);
+      if (!response.ok) throw new Error('Failed to fetch home');
+      
+      const home: HomeSnapshot = await response.json();
+      set({ home, categories: home.categories });
+    } catch (error) {
+      console.error('Fetch home error:', error);
+    }
+  },
+  
   fetchEvents: async (category?: string) => {
     try {
       set({ isLoadingEvents: true });
@@ -144,16 +229,13 @@ export const useDataStore = create<DataState>((set, get) => ({
 
   updateEvent: async (id, updates) => {
     try {
-      const headers = await getAuthHeader();
-      const response = await fetch(`${API_URL}/api/events/${id}`, {
-        method: 'PUT',
-        headers: { 'Content-Type': 'application/json', ...headers },
-        body: JSON.stringify(updates),
-      });
-      if (!response.ok) throw new Error('Failed to update event');
-      const updatedEvent = await response.json();
+      const original = get().events.find(e => e.id === id);
+      const updatedEvent = await putVersioned(`${API_URL}/api/events/${id}`, original, updates);
       set(state => ({ events: state.events.map(e => e.id === id ? updatedEvent : e) }));
     } catch (error) {
+      if (error instanceof ConflictError) {
+        set(state => ({ events: state.events.map(e => e.id === id ? (error as ConflictError).current : e) }));
+      }
       console.error('Update event error:', error);
       throw error;
     }
@@ -173,6 +255,24 @@ export const useDataStore = create<DataState>((set, get) => ({
       throw error;
     }
   },
+
+  restoreEvent: async (id) => {
+    try {
+      const headers = await getAuthHeader();
+      const response = await fetch(`${API_URL}/api/events/${id}/restore`, {
+        method: 'POST',
+        headers,
+      });
+      if (!response.ok) throw new Error('Failed to restore event');
+      const restored = await response.json();
+      set(state => ({
+        events: [...state.events, restored].sort((a, b) => a.start_time.localeCompare(b.start_time)),
+      }));
+    } catch (error) {
+      console.error('Restore event error:', error);
+      throw error;
+    }
+  },
   
   createEventRaw: async (event) => {
     const headers = await getAuthHeader();
@@ -222,16 +322,13 @@ export const useDataStore = create<DataState>((set, get) => ({
 
   updateNews: async (id, updates) => {
     try {
-      const headers = await getAuthHeader();
-      const response = await fetch(`${API_URL}/api/news/${id}`, {
-        method: 'PUT',
-        headers: { 'Content-Type': 'application/json', ...headers },
-        body: JSON.stringify(updates),
-      });
-      if (!response.ok) throw new Error('Failed to update news');
-      const updatedNews = await response.json();
+      const original = get().news.find(n => n.id === id);
+      const updatedNews = await putVersioned(`${API_URL}/api/news/${id}`, original, updates);
       set(state => ({ news: state.news.map(n => n.id === id ? updatedNews : n) }));
     } catch (error) {
+      if (error instanceof ConflictError) {
+        set(state => ({ news: state.news.map(n => n.id === id ? (error as ConflictError).current : n) }));
+      }
       console.error('Update news error:', error);
       throw error;
     }
@@ -251,4 +348,22 @@ export const useDataStore = create<DataState>((set, get) => ({
       throw error;
     }
   },
+
+  restoreNews: async (id) => {
+    try {
+      const headers = await getAuthHeader();
+      const response = await fetch(`${API_URL}/api/news/${id}/restore`, {
+        method: 'POST',
+        headers,
+      });
+      if (!response.ok) throw new Error('Failed to restore news');
+      const restored = await response.json();
+      set(state => ({
+        news: [...state.news, restored].sort((a, b) => b.publish_date.localeCompare(a.publish_date)),
+      }));
+    } catch (error) {
+      console.error('Restore news error:', error);
+      throw error;
+    }
+  },
 }));